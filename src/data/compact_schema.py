@@ -0,0 +1,85 @@
+import pandas as pd
+
+
+class CompactSchema:
+    """
+    Shrinks freshly ingested frames before they are pivoted, merged or featurized.
+
+    - Columns with a single value (e.g. `indicator`, `unit`, `decimal` in World Bank
+      downloads) are removed from the frame and kept once in `metadata`.
+    - Repeated strings (e.g. `country`, `countryiso3code`) become categoricals.
+    - Integers are downcast; floats are downcast to float32 only when `downcast_float=True`.
+
+    Attributes:
+        protect (list): Columns that are never dropped, even if constant (e.g. pivot keys).
+        category_ratio (float): Convert string columns whose unique/rows ratio is at most this.
+        downcast_float (bool): Downcast float64 columns to float32.
+        metadata (dict): name -> {column: constant value} for the dropped columns.
+        report (list): One dict per `transform` call with memory before/after.
+
+    Methods:
+        transform(self, df, name=None) -> pd.DataFrame
+    """
+    def __init__(self, protect=None, category_ratio=0.5, downcast_float=False):
+        """
+        Initializes CompactSchema.
+
+        Args:
+            protect (list, optional): Columns to keep even if constant. Defaults to None.
+            category_ratio (float, optional): Unique/rows threshold for categoricals. Defaults to 0.5.
+            downcast_float (bool, optional): Downcast floats to float32. Defaults to False.
+        """
+        self.protect = set(protect or [])
+        self.category_ratio = category_ratio
+        self.downcast_float = downcast_float
+        self.metadata = {}
+        self.report = []
+
+    def transform(self, df, name=None):
+        """
+        Returns a compact copy of `df`.
+
+        Args:
+            df (pd.DataFrame): Frame to compact.
+            name (str, optional): Key for `metadata` and the report (e.g. the indicator code).
+
+        Returns:
+            pd.DataFrame: Compacted frame.
+        """
+        mem_before = df.memory_usage(deep=True).sum()
+        df_out = df.copy()
+        n_rows = len(df_out)
+        constants = {}
+
+        for col in df_out.columns:
+            series = df_out[col]
+            n_unique = series.nunique(dropna=False)
+            if n_rows > 0 and n_unique <= 1 and col not in self.protect:
+                constants[col] = series.iloc[0]
+            elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+                if n_unique <= self.category_ratio * n_rows:
+                    df_out[col] = series.astype('category')
+            elif pd.api.types.is_integer_dtype(series.dtype):
+                df_out[col] = pd.to_numeric(series, downcast='integer')
+            elif self.downcast_float and pd.api.types.is_float_dtype(series.dtype):
+                df_out[col] = pd.to_numeric(series, downcast='float')
+
+        df_out = df_out.drop(columns=list(constants))
+        mem_after = df_out.memory_usage(deep=True).sum()
+        key = name if name is not None else len(self.report)
+        self.metadata[key] = constants
+        self.report.append({
+            'name': key,
+            'rows': n_rows,
+            'memory_before': int(mem_before),
+            'memory_after': int(mem_after),
+            'saved_pct': 100 * (1 - mem_after / mem_before) if mem_before else 0.0,
+            'dropped': list(constants),
+        })
+        print(f"Compacted {key}: {mem_before / 1e3:.1f} kB -> {mem_after / 1e3:.1f} kB "
+              f"({self.report[-1]['saved_pct']:.0f}% saved)")
+        return df_out
+
+    def report_frame(self):
+        """Returns the memory report as a DataFrame."""
+        return pd.DataFrame(self.report)
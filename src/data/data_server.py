@@ -0,0 +1,367 @@
+import atexit
+import os
+import secrets
+import threading
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Client, Listener
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_ADDRESS = ('127.0.0.1', 6001)
+DEFAULT_KEY_PATH = os.path.join(os.path.expanduser('~'), '.graspp', 'data_server.key')
+DEFAULT_DATASETS = {
+    'world_bank_data': "data/examples/module_1/world_bank_data.csv",
+    'ghg': "data/examples/module_2/ghg.csv",
+    'democracy_gdp': "data/examples/module_3/democracy_gdp.csv",
+    'education': "data/examples/module_3/education.csv",
+    'gini': "data/examples/module_3/gini.csv",
+    'pisa': "data/examples/module_3/pisa.csv",
+    'eu_press_releases_ghg': "data/examples/module_4/eu_press_releases_ghg.csv",
+}
+
+
+def _attach(name):
+    """Attaches to an existing shared-memory block without letting this process unlink it on exit."""
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no `track`; undo the resource tracker registration by hand
+        shm = SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+def write_authkey(path=DEFAULT_KEY_PATH):
+    """Generates a random connection key and writes it to `path`, readable by the current user only."""
+    authkey = secrets.token_bytes(32)
+    os.makedirs(os.path.dirname(path) or '.', mode=0o700, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        os.fchmod(f.fileno(), 0o600)  # an existing file keeps its old mode otherwise
+        f.write(authkey)
+    return authkey
+
+
+def read_authkey(path=DEFAULT_KEY_PATH):
+    """Reads the key written by a running `DataServer`."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def frame_to_shared(df, category_ratio=0.5):
+    """
+    Copies a DataFrame into one shared-memory block.
+
+    Numeric, boolean and datetime columns are stored as raw arrays. Text columns with few
+    distinct values (unique/rows at most `category_ratio`) are stored as categorical codes
+    with the categories in the layout; other text columns (e.g. press release bodies) are
+    stored in the block as UTF-8 bytes plus an offsets array, so the layout sent to clients
+    stays small however much text a dataset holds.
+
+    Returns:
+        tuple: (SharedMemory, layout dict describing every column).
+    """
+    arrays, columns = [], []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype) \
+                or (pd.api.types.is_datetime64_dtype(series.dtype) and series.dt.tz is None):
+            values = np.ascontiguousarray(series.to_numpy())
+            columns.append({'name': col, 'kind': 'array', 'buffers': [values.dtype.str]})
+            arrays.append([values])
+        elif (pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)) \
+                and series.nunique(dropna=True) > category_ratio * len(series):
+            missing = series.isna().to_numpy()
+            encoded = [b'' if is_missing else str(value).encode('utf-8')
+                       for value, is_missing in zip(series.to_numpy(), missing)]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+            blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+            columns.append({'name': col, 'kind': 'string', 'buffers': ['|u1', offsets.dtype.str, '|b1'],
+                            'lengths': [len(blob), len(offsets), len(missing)]})
+            arrays.append([blob, offsets, missing])
+        else:
+            categorical = pd.Categorical(series)
+            values = np.ascontiguousarray(categorical.codes.astype(np.int32))
+            columns.append({'name': col, 'kind': 'category', 'buffers': [values.dtype.str],
+                            'categories': categorical.categories.tolist(), 'ordered': categorical.ordered})
+            arrays.append([values])
+
+    offset = 0
+    for column, buffers in zip(columns, arrays):
+        column['offsets'] = []
+        for values in buffers:
+            offset = -(-offset // 8) * 8
+            column['offsets'].append(offset)
+            offset += values.nbytes
+    shm = SharedMemory(create=True, size=max(offset, 1))
+    for column, buffers in zip(columns, arrays):
+        for values, start in zip(buffers, column['offsets']):
+            target = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf, offset=start)
+            target[:] = values
+    layout = {'shm_name': shm.name, 'n_rows': len(df), 'columns': columns}
+    return shm, layout
+
+
+def frame_from_shared(shm, layout):
+    """
+    Builds a DataFrame from the shared-memory block.
+
+    Array and categorical columns are read-only views on the block; text columns are
+    decoded from the block's UTF-8 bytes into Python strings.
+    """
+    data = {}
+    for column in layout['columns']:
+        lengths = column.get('lengths', [layout['n_rows']] * len(column['buffers']))
+        buffers = []
+        for dtype, start, length in zip(column['buffers'], column['offsets'], lengths):
+            values = np.ndarray(length, dtype=np.dtype(dtype), buffer=shm.buf, offset=start)
+            values.flags.writeable = False
+            buffers.append(values)
+        if column['kind'] == 'category':
+            data[column['name']] = pd.Categorical.from_codes(buffers[0], categories=column['categories'],
+                                                             ordered=column['ordered'])
+        elif column['kind'] == 'string':
+            blob, offsets, missing = buffers
+            raw = blob.tobytes()
+            bounds = offsets.tolist()
+            data[column['name']] = np.array(
+                [None if is_missing else raw[lo:hi].decode('utf-8')
+                 for lo, hi, is_missing in zip(bounds[:-1], bounds[1:], missing.tolist())], dtype=object)
+        else:
+            data[column['name']] = buffers[0]
+    return pd.DataFrame(data, copy=False)
+
+
+class DataServer:
+    """
+    Local process that loads datasets once and shares them with other processes.
+
+    Each dataset lives in a shared-memory block; clients connect over a local socket
+    (`multiprocessing.connection`, authenticated with a random key that the server writes
+    to a user-only file and `DataClient` reads), receive the block name and column layout,
+    and map the block directly, so a dataset is read from disk or the World Bank API once
+    no matter how many notebooks, Streamlit sessions or pipeline runs use it. A background thread reloads CSVs whose modification time changed and re-runs
+    callable loaders every `refresh_s` seconds; clients pick up the new version on their
+    next `get`.
+
+    Attributes:
+        datasets (dict): name -> CSV path, or a zero-argument callable returning a DataFrame
+            (e.g. `lambda: DownloadWorldBank([...], [...]).run()`).
+        address (tuple): (host, port) to listen on.
+        key_path (str): File holding the connection key (mode 0600).
+        category_ratio (float): Unique/rows threshold for sharing text columns as categoricals.
+        refresh_s (int): Seconds between refresh checks.
+
+    Methods:
+        load(self, name) -> None
+        serve_forever(self) -> None
+        close(self) -> None
+    """
+    def __init__(self, datasets=None, address=DEFAULT_ADDRESS, key_path=DEFAULT_KEY_PATH, refresh_s=60,
+                 category_ratio=0.5):
+        """
+        Initializes DataServer and loads every dataset.
+
+        Args:
+            datasets (dict, optional): Datasets to serve. Defaults to the CSVs in data/examples.
+            address (tuple, optional): Listening address. Defaults to ('127.0.0.1', 6001).
+            key_path (str, optional): Where the random connection key is written.
+                Defaults to ~/.graspp/data_server.key.
+            refresh_s (int, optional): Refresh interval in seconds. Defaults to 60.
+            category_ratio (float, optional): Unique/rows threshold below which text columns
+                are shared as categoricals. Defaults to 0.5.
+        """
+        self.datasets = DEFAULT_DATASETS if datasets is None else datasets
+        self.address = address
+        self.key_path = key_path
+        self.refresh_s = refresh_s
+        self.category_ratio = category_ratio
+        self.blocks = {}
+        self.layouts = {}
+        self.versions = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self._serve_thread = None
+        self._authkey = None
+        for name in self.datasets:
+            self.load(name)
+
+    def _mtime(self, name):
+        source = self.datasets[name]
+        return None if callable(source) else os.path.getmtime(source)
+
+    def load(self, name):
+        """(Re)loads one dataset into a new shared-memory block and retires the old one."""
+        source = self.datasets[name]
+        start = time.perf_counter()
+        df = source() if callable(source) else pd.read_csv(source)
+        shm, layout = frame_to_shared(df, self.category_ratio)
+        with self.lock:
+            old = self.blocks.get(name)
+            self.blocks[name], self.layouts[name] = shm, layout
+            self.versions[name] = (self._mtime(name), time.monotonic())
+        if old is not None:
+            # Clients that already mapped the old block keep their mapping until they drop it
+            old.close()
+            old.unlink()
+        print(f"Loaded {name}: {df.shape[0]} rows x {df.shape[1]} columns "
+              f"({shm.size / 1e6:.1f} MB) in {time.perf_counter() - start:.2f}s")
+
+    def _refresh_loop(self):
+        while not self.stop_event.wait(self.refresh_s):
+            for name, source in self.datasets.items():
+                mtime, loaded_at = self.versions[name]
+                try:
+                    if callable(source):
+                        stale = time.monotonic() - loaded_at >= self.refresh_s
+                    else:
+                        stale = self._mtime(name) != mtime
+                    if stale:
+                        self.load(name)
+                except Exception as exc:
+                    print(f"Refresh of {name} failed, keeping the previous version: {exc}")
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    return
+                command = request[0]
+                with self.lock:
+                    if command == 'list':
+                        conn.send({'ok': True, 'datasets': {n: l['n_rows'] for n, l in self.layouts.items()}})
+                    elif command == 'get' and request[1] in self.layouts:
+                        conn.send({'ok': True, 'layout': self.layouts[request[1]]})
+                    else:
+                        conn.send({'ok': False, 'error': f"Unknown request or dataset: {request}"})
+
+    def serve_forever(self):
+        """Accepts client connections until `close` is called (from any thread) or Ctrl+C."""
+        threading.Thread(target=self._refresh_loop, daemon=True).start()
+        # A fresh key per run: the listener unpickles requests, so only this user's processes may connect
+        self._authkey = write_authkey(self.key_path)
+        with Listener(self.address, authkey=self._authkey) as listener:
+            self._serve_thread = threading.current_thread()
+            print(f"Data server listening on {self.address[0]}:{self.address[1]}")
+            try:
+                while not self.stop_event.is_set():
+                    conn = listener.accept()
+                    if self.stop_event.is_set():
+                        conn.close()
+                        break
+                    threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                self._serve_thread = None
+                self.close()
+
+    def close(self):
+        """Stops serving and refreshing and releases every shared-memory block."""
+        self.stop_event.set()
+        serve_thread = self._serve_thread
+        if serve_thread is not None and serve_thread is not threading.current_thread():
+            # accept() blocks until a client connects; connect once so the serving loop sees stop_event
+            try:
+                Client(self.address, authkey=self._authkey).close()
+            except OSError:
+                pass
+        with self.lock:
+            for shm in self.blocks.values():
+                shm.close()
+                shm.unlink()
+            self.blocks.clear()
+            self.layouts.clear()
+
+
+class DataClient:
+    """
+    Client for `DataServer`.
+
+    Usage:
+        client = DataClient()
+        df = client.get('democracy_gdp', fallback_path="data/examples/module_3/democracy_gdp.csv")
+
+    Returned frames are read-only views on shared memory; call `.copy()` before modifying
+    them in place. If the server is not running and a `fallback_path` is given, the CSV is
+    read directly so callers work either way. `close` (also run at interpreter exit)
+    releases the mappings.
+    """
+    def __init__(self, address=DEFAULT_ADDRESS, key_path=DEFAULT_KEY_PATH):
+        self.address = address
+        self.key_path = key_path
+        self.attached = {}
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Releases every mapping; frames returned by `get` stay readable until they are dropped."""
+        for shm in self.attached.values():
+            try:
+                shm.close()
+            except BufferError:
+                # Frames still point into the mapping: leave it to them (it is unmapped when they
+                # are freed) so SharedMemory.__del__ does not fail on it at exit
+                shm._buf, shm._mmap = None, None
+                shm.close()
+        self.attached.clear()
+
+    def _request(self, *request):
+        # Read the key on every request so a restarted server (new key) is picked up
+        with Client(self.address, authkey=read_authkey(self.key_path)) as conn:
+            conn.send(request)
+            response = conn.recv()
+        if not response['ok']:
+            raise KeyError(response['error'])
+        return response
+
+    def list(self):
+        """Returns {dataset name: number of rows} for everything the server holds."""
+        return self._request('list')['datasets']
+
+    def get(self, name, fallback_path=None):
+        """
+        Returns a dataset as a DataFrame backed by shared memory.
+
+        Args:
+            name (str): Dataset name on the server.
+            fallback_path (str, optional): CSV read directly if the server is unreachable.
+
+        Returns:
+            pd.DataFrame: The dataset.
+        """
+        for attempt in range(3):
+            try:
+                layout = self._request('get', name)['layout']
+            except (ConnectionRefusedError, FileNotFoundError):
+                if fallback_path is None:
+                    raise
+                print(f"Data server not reachable, reading {fallback_path}")
+                return pd.read_csv(fallback_path)
+            shm = self.attached.get(layout['shm_name'])
+            if shm is None:
+                try:
+                    shm = _attach(layout['shm_name'])
+                except FileNotFoundError:
+                    # The server swapped in a refreshed version between the two calls; ask again
+                    continue
+                # Keep the mapping alive as long as the client; the views below point into it
+                self.attached[layout['shm_name']] = shm
+            return frame_from_shared(shm, layout)
+        raise RuntimeError(f"Could not attach to dataset {name}")
+
+
+if __name__ == '__main__':
+    # Start with: python -m src.data.data_server
+    DataServer().serve_forever()
@@ -1,10 +1,9 @@
 import requests
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+from src.data.compact_schema import CompactSchema
 
 class DownloadWorldBank:
-    def __init__(self, indicators, countries, date_start=None, date_end=None):
+    def __init__(self, indicators, countries, date_start=None, date_end=None, compact=True, downcast_float=False):
         self.indicators = indicators
         self.countries = countries
         self.date_start = date_start
@@ -13,6 +12,8 @@ class DownloadWorldBank:
         self.dfs = {}
         self.dfs_pivot = {}
         self.dfs_final = {}
+        self.duplicate_keys = {}
+        self.compact = CompactSchema(protect=['countryiso3code', 'date', 'value'], downcast_float=downcast_float) if compact else None
 
     def download(self, indicator, save_data=False):
         country_codes = ';'.join(self.countries)
@@ -22,8 +23,10 @@ class DownloadWorldBank:
         url = self.url_base + url
         response = requests.get(url)
         df = pd.read_xml(response.content)
-        df['series'] = indicator
         df['date'] = pd.to_datetime(df['date'], format="%Y")
+        if self.compact is not None:
+            df = self.compact.transform(df, name=indicator)
+        df['series'] = indicator
         self.dfs[indicator] = df
         if save_data:
             print(f"data save here: data/raw_{indicator}.csv")
@@ -31,7 +34,14 @@ class DownloadWorldBank:
         return df
 
     def pivot(self, indicator):
-        self.dfs_pivot[indicator] = self.dfs[indicator].pivot(index=['countryiso3code', 'date'], columns=['series'], values='value').reset_index()
+        df = self.dfs[indicator]
+        duplicated = df.duplicated(subset=['countryiso3code', 'date'])
+        if duplicated.any():
+            # pivot cannot hold duplicate keys; record them so validation reports what was dropped
+            self.duplicate_keys[indicator] = df.loc[duplicated, ['countryiso3code', 'date']].reset_index(drop=True)
+            print(f"Dropping {duplicated.sum()} duplicate (country, date) rows in {indicator}")
+            df = df.loc[~duplicated]
+        self.dfs_pivot[indicator] = df.pivot(index=['countryiso3code', 'date'], columns=['series'], values='value').reset_index()
         return self.dfs_pivot[indicator]
 
     def rename_convert(self, indicator):
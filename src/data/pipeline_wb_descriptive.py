@@ -1,7 +1,6 @@
 import requests
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+from src.features.aggregate_cube import AggregateCube
 
 class PipelineWBDescriptive:
     def __init__(self, indicator, countries, date_start=None, date_end=None):
@@ -12,7 +11,8 @@ class PipelineWBDescriptive:
         self.url_base = 'http://api.worldbank.org/v2/'
         self.df = None
         self.df_pivot = None
-        self.df_final = None        
+        self.df_final = None
+        self.cube = None
 
     def download(self, save_data=False):
         country_codes = ';'.join(self.countries)
@@ -39,10 +39,13 @@ class PipelineWBDescriptive:
         if save_data:
             print(f"data save here: cleaned_{self.indicator}.csv")
             self.df_final.to_csv(f'data/cleaned_{self.indicator}.csv')
+        self.cube = None  # rebuilt from the new data on the next plot_descriptive call
         return self.df_final
 
     def plot_timeseries(self, title='Military Expenditure', filename=False):
-        
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         plt.figure(figsize=(12, 8))
         sns.lineplot(data=self.df_final, x='date', y=self.indicator, hue='country')
         plt.ylabel("GDP", size=20)
@@ -60,8 +63,11 @@ class PipelineWBDescriptive:
         plt.show()
 
     def plot_descriptive(self, title='Descriptive Statistics', filename=False):
-        
-        desc_stats = self.df_final.groupby("country")[self.indicator].describe().drop(['count'], axis = 'columns').transpose().plot(kind = 'barh')
+        import matplotlib.pyplot as plt
+
+        if self.cube is None:
+            self.cube = AggregateCube(entity_col='country', time_col='date').update(self.df_final)
+        desc_stats = self.cube.describe(self.indicator).drop(['count'], axis = 'columns').transpose()
         desc_stats.plot(kind='barh', figsize=(12, 8), title=title)
         plt.xlabel("Value", size=16)
         plt.ylabel("Country", size=16)
@@ -73,10 +79,11 @@ class PipelineWBDescriptive:
             plt.savefig(f"reports/{filename}.png", dpi=120, bbox_inches='tight', transparent=False)
         plt.show()
 
-# Example Usage
-analyze = PipelineWBDescriptive(
-    indicator='MS.MIL.XPND.GD.ZS',
-    countries=['US', 'CA', 'MX', 'JP'],
-    date_start='2020',
-    date_end='2023'
-)
\ No newline at end of file
+if __name__ == '__main__':
+    # Example Usage
+    analyze = PipelineWBDescriptive(
+        indicator='MS.MIL.XPND.GD.ZS',
+        countries=['US', 'CA', 'MX', 'JP'],
+        date_start='2020',
+        date_end='2023'
+    )
\ No newline at end of file
@@ -0,0 +1,144 @@
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+class ValidateData:
+    """
+    Checks a country/date panel before feature generation and prunes what would only waste work.
+
+    All checks are vectorized over the whole frame (no per-country loops) and run cheapest
+    first; a duplicate (country, date) key, which would make `pivot` and the grouped
+    features wrong, stops validation immediately unless `on_duplicates='drop'`.
+
+    Checks:
+        1. Key uniqueness of (entity_col, time_col).
+        2. Dates strictly increasing within each country (re-sorted if `sort=True`).
+        3. Empty numeric columns (all NaN, or below `min_coverage`), which are pruned.
+        4. Coverage: share of non-missing values per country and per year.
+        5. Outliers: robust z-score (median/MAD) above `outlier_z`, counted per column.
+
+    Attributes:
+        entity_col (str): Entity key. Defaults to 'country'.
+        time_col (str): Time key. Defaults to 'date'.
+        on_duplicates (str): 'raise' or 'drop' (keep the first row per key).
+        min_coverage (float): Numeric columns with a lower non-missing share are pruned.
+        outlier_z (float): Robust z-score threshold.
+        sort (bool): Sort by (entity, time) when dates are not increasing within countries.
+        report (dict): Compact results of the last `validate` call.
+
+    Methods:
+        validate(self, df) -> pd.DataFrame
+    """
+    def __init__(self, entity_col='country', time_col='date', on_duplicates='raise', min_coverage=0.0,
+                 outlier_z=5.0, sort=True):
+        """
+        Initializes ValidateData.
+
+        Args:
+            entity_col (str, optional): Entity key. Defaults to 'country'.
+            time_col (str, optional): Time key. Defaults to 'date'.
+            on_duplicates (str, optional): 'raise' or 'drop'. Defaults to 'raise'.
+            min_coverage (float, optional): Minimum non-missing share to keep a column. Defaults to 0.0.
+            outlier_z (float, optional): Robust z-score threshold. Defaults to 5.0.
+            sort (bool, optional): Fix non-increasing dates by sorting. Defaults to True.
+        """
+        if on_duplicates not in ('raise', 'drop'):
+            raise ValueError("on_duplicates must be 'raise' or 'drop'.")
+        self.entity_col = entity_col
+        self.time_col = time_col
+        self.on_duplicates = on_duplicates
+        self.min_coverage = min_coverage
+        self.outlier_z = outlier_z
+        self.sort = sort
+        self.report = {}
+
+    def validate(self, df):
+        """
+        Validates `df` and returns a cleaned frame.
+
+        Args:
+            df (pd.DataFrame): Panel with entity/time keys as columns (e.g. `DownloadWorldBank.run` output).
+
+        Returns:
+            pd.DataFrame: Frame without duplicate keys or pruned columns, ordered by (entity, time).
+
+        Raises:
+            ValueError: If the key columns are missing, or keys are duplicated and `on_duplicates='raise'`.
+        """
+        start = time.perf_counter()
+        keys = [self.entity_col, self.time_col]
+        missing_keys = [key for key in keys if key not in df.columns]
+        if missing_keys:
+            raise ValueError(f"DataFrame must have {missing_keys} as columns.")
+
+        # 1. Key uniqueness
+        duplicated = df.duplicated(subset=keys, keep='first')
+        n_duplicates = int(duplicated.sum())
+        if n_duplicates:
+            if self.on_duplicates == 'raise':
+                examples = df.loc[duplicated, keys].head(5).to_dict('records')
+                raise ValueError(f"{n_duplicates} duplicate ({self.entity_col}, {self.time_col}) keys, e.g. {examples}")
+            df = df.loc[~duplicated]
+
+        # 2. Dates increasing within each country (compared per group, so interleaved countries are caught)
+        step = df.groupby(self.entity_col, observed=True, sort=False)[self.time_col].diff()
+        if pd.api.types.is_timedelta64_dtype(step):
+            step = step.dt.total_seconds()
+        n_unordered = int((step <= 0).sum())
+        if n_unordered and self.sort:
+            df = df.sort_values(keys, kind='stable')
+
+        # 3. Empty columns
+        num_cols = df.select_dtypes(include='number').columns
+        values = df[num_cols].to_numpy(dtype=float)
+        observed = ~np.isnan(values)
+        coverage = observed.mean(axis=0) if len(df) else np.zeros(len(num_cols))
+        pruned = [col for col, share in zip(num_cols, coverage) if share == 0 or share < self.min_coverage]
+        keep = np.array([col not in pruned for col in num_cols], dtype=bool)
+
+        # 4. Coverage per country and per year
+        observed_df = pd.DataFrame(observed[:, keep], columns=num_cols[keep], index=df.index)
+        coverage_country = observed_df.groupby(df[self.entity_col], observed=True).mean()
+        years = df[self.time_col]
+        if not pd.api.types.is_numeric_dtype(years):
+            years = pd.to_datetime(years).dt.year
+        coverage_year = observed_df.groupby(years).mean()
+
+        # 5. Outliers (robust z-score on the kept columns)
+        kept_values = values[:, keep]
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            # All-NaN columns were pruned, but all-NaN slices can still warn in nanmedian
+            warnings.simplefilter('ignore', RuntimeWarning)
+            median = np.nanmedian(kept_values, axis=0)
+            mad = 1.4826 * np.nanmedian(np.abs(kept_values - median), axis=0)
+            robust_z = np.abs(kept_values - median) / mad
+        n_outliers = np.nansum(robust_z > self.outlier_z, axis=0).astype(int)
+
+        df_out = df.drop(columns=pruned)
+        elapsed = time.perf_counter() - start
+        self.report = {
+            'rows': len(df_out),
+            'duplicate_keys': n_duplicates,
+            'unordered_dates': n_unordered,
+            'pruned_columns': pruned,
+            'columns': pd.DataFrame({'coverage': coverage[keep], 'n_outliers': n_outliers}, index=num_cols[keep]),
+            'coverage_country': coverage_country,
+            'coverage_year': coverage_year,
+            'elapsed_s': elapsed,
+        }
+        print(f"Validation: {len(df_out)} rows, {n_duplicates} duplicate keys, {n_unordered} unordered dates, "
+              f"{len(pruned)} columns pruned, {int(n_outliers.sum())} outliers flagged ({elapsed * 1000:.1f} ms)")
+        return df_out
+
+
+if __name__ == '__main__':
+    # Example Usage
+    df = pd.read_csv("data/examples/module_3/democracy_gdp.csv")
+    # democracy_gdp.csv repeats some (country, year) keys, e.g. KOR and TWN
+    validator = ValidateData(entity_col='country', time_col='year', on_duplicates='drop')
+    df_valid = validator.validate(df)
+    print(validator.report['columns'])
+    print(validator.report['coverage_country'].head())
@@ -0,0 +1,231 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+
+class QuantileSketch:
+    """
+    Small mergeable quantile sketch (a merging t-digest).
+
+    Values are kept as weighted centroids; centroids are merged as long as they stay within
+    the size the t-digest scale function allows at their quantile, so the tails keep more
+    resolution than the middle. Two sketches merge by pooling and re-compressing their
+    centroids, which is what lets the cube combine periods or add new years without
+    going back to the raw data.
+    """
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = np.array([], dtype=float)
+        self.weights = np.array([], dtype=float)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        def k_limit(q):
+            # k1 scale function: a centroid may span at most one unit of k
+            return self.compression / (2 * np.pi) * np.arcsin(2 * min(max(q, 0.0), 1.0) - 1)
+
+        new_means, new_weights = [], []
+        cur_mean, cur_weight, q_start = means[0], weights[0], 0.0
+        for mean, weight in zip(means[1:], weights[1:]):
+            q_end = (q_start * total + cur_weight + weight) / total
+            if k_limit(q_end) - k_limit(q_start) <= 1:
+                cur_mean += (mean - cur_mean) * weight / (cur_weight + weight)
+                cur_weight += weight
+            else:
+                new_means.append(cur_mean)
+                new_weights.append(cur_weight)
+                q_start += cur_weight / total
+                cur_mean, cur_weight = mean, weight
+        new_means.append(cur_mean)
+        new_weights.append(cur_weight)
+        self.means, self.weights = np.array(new_means), np.array(new_weights)
+
+    def add(self, values):
+        """Adds raw values (NaNs are ignored)."""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def merge(self, other):
+        """Returns a new sketch combining `self` and `other`."""
+        merged = QuantileSketch(self.compression)
+        merged.min, merged.max = min(self.min, other.min), max(self.max, other.max)
+        means = np.concatenate([self.means, other.means])
+        if len(means):
+            merged._compress(means, np.concatenate([self.weights, other.weights]))
+        return merged
+
+    def quantile(self, q):
+        """q-quantile; exact (pandas' linear rule) while no centroids have merged, approximate after."""
+        if len(self.means) == 0:
+            return np.nan
+        if np.all(self.weights == 1):
+            # Every centroid is still a raw value, so this is the exact quantile
+            return float(np.quantile(self.means, q))
+        if len(self.means) == 1:
+            return float(self.means[0])
+        total = self.weights.sum()
+        # Centroid centres sit at the middle of their cumulative weight
+        centers = (np.cumsum(self.weights) - self.weights / 2) / total
+        xs = np.concatenate([[0.0], centers, [1.0]])
+        ys = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q, xs, ys))
+
+
+class AggregateCube:
+    """
+    Precomputed descriptive statistics per (country, indicator, period bucket).
+
+    Every cell holds mergeable aggregates: count, mean, sum of squared deviations (M2),
+    min, max and a `QuantileSketch`. Cells for all periods combined are stored as well, so
+    the usual `groupby('country').describe()` table becomes a dictionary lookup per
+    country. New years are added with `update`, which only touches the affected cells and
+    skips (country, indicator, year) triples that are already in the cube.
+
+    Attributes:
+        entity_col (str): Entity column. Defaults to 'country'.
+        time_col (str): Time column (datetime or integer year). Defaults to 'date'.
+        bucket_years (int): Width of a period bucket in years.
+        compression (int): Quantile sketch compression.
+        cells (dict): (country, indicator, bucket) -> aggregate dict; bucket 'all' covers every period.
+
+    Methods:
+        update(self, df) -> AggregateCube
+        describe(self, indicator, countries=None, period='all') -> pd.DataFrame
+        save(self, path) -> None
+        load(path) -> AggregateCube
+    """
+    def __init__(self, entity_col='country', time_col='date', bucket_years=5, compression=100):
+        """
+        Initializes an empty AggregateCube.
+
+        Args:
+            entity_col (str, optional): Entity column. Defaults to 'country'.
+            time_col (str, optional): Time column. Defaults to 'date'.
+            bucket_years (int, optional): Years per period bucket. Defaults to 5.
+            compression (int, optional): Quantile sketch compression. Defaults to 100.
+        """
+        self.entity_col = entity_col
+        self.time_col = time_col
+        self.bucket_years = bucket_years
+        self.compression = compression
+        self.cells = {}
+        self.years_seen = set()
+
+    def _empty_cell(self):
+        return {'count': 0, 'mean': 0.0, 'm2': 0.0, 'min': np.inf, 'max': -np.inf,
+                'sketch': QuantileSketch(self.compression)}
+
+    def _add_to_cell(self, key, values):
+        cell = self.cells.setdefault(key, self._empty_cell())
+        # Chan et al.'s parallel update of (count, mean, M2): no large sums of squares that
+        # cancel for series like GDP in USD
+        n_a, n_b = cell['count'], len(values)
+        mean_b = values.mean()
+        m2_b = ((values - mean_b) ** 2).sum()
+        delta = mean_b - cell['mean']
+        n = n_a + n_b
+        cell['mean'] += delta * n_b / n
+        cell['m2'] += m2_b + delta ** 2 * n_a * n_b / n
+        cell['count'] = n
+        cell['min'] = min(cell['min'], values.min())
+        cell['max'] = max(cell['max'], values.max())
+        cell['sketch'].add(values)
+
+    def update(self, df):
+        """
+        Adds a panel (wide, one numeric column per indicator) to the cube.
+
+        Args:
+            df (pd.DataFrame): Panel with entity/time columns, e.g. `DownloadWorldBank.run` output.
+
+        Returns:
+            AggregateCube: self, so `AggregateCube().update(df)` can be chained.
+        """
+        data = df.reset_index() if self.entity_col not in df.columns else df
+        years = data[self.time_col]
+        years = years.dt.year if pd.api.types.is_datetime64_any_dtype(years) else years.astype(int)
+        value_cols = [col for col in data.select_dtypes(include='number').columns if col != self.time_col]
+        long_df = pd.DataFrame({
+            'entity': np.repeat(data[self.entity_col].astype(str).to_numpy(), len(value_cols)),
+            'year': np.repeat(years.to_numpy(), len(value_cols)),
+            'indicator': np.tile(np.array(value_cols, dtype=object), len(data)),
+            'value': data[value_cols].to_numpy(dtype=float).ravel(),
+        }).dropna(subset=['value'])
+
+        triples = list(zip(long_df['entity'], long_df['indicator'], long_df['year'].tolist()))
+        is_new = np.array([triple not in self.years_seen for triple in triples], dtype=bool)
+        self.years_seen.update(triple for triple, new in zip(triples, is_new) if new)
+        long_df = long_df.loc[is_new].assign(bucket=lambda d: d['year'] // self.bucket_years * self.bucket_years)
+
+        for (entity, indicator, bucket), group in long_df.groupby(['entity', 'indicator', 'bucket'], sort=False):
+            values = group['value'].to_numpy()
+            self._add_to_cell((entity, indicator, int(bucket)), values)
+            self._add_to_cell((entity, indicator, 'all'), values)
+        print(f"Cube updated with {len(long_df)} new values ({len(self.cells)} cells)")
+        return self
+
+    def _cell_stats(self, cell):
+        n = cell['count']
+        sketch = cell['sketch']
+        return {'count': n, 'mean': cell['mean'], 'std': np.sqrt(cell['m2'] / (n - 1)) if n > 1 else np.nan,
+                'min': cell['min'], '25%': sketch.quantile(0.25), '50%': sketch.quantile(0.5),
+                '75%': sketch.quantile(0.75), 'max': cell['max']}
+
+    def describe(self, indicator, countries=None, period='all'):
+        """
+        Returns the `df.groupby('country')[indicator].describe()` table from the cube.
+
+        Quantiles are exact while a cell holds fewer values than the sketch compresses
+        (every World Bank cell), and approximate beyond that.
+
+        Args:
+            indicator (str): Indicator column.
+            countries (list, optional): Countries to include. Defaults to every country in the cube.
+            period (int or str, optional): Bucket start year, or 'all'. Defaults to 'all'.
+
+        Returns:
+            pd.DataFrame: count, mean, std, min, 25%, 50%, 75%, max per country.
+        """
+        if countries is None:
+            countries = sorted({key[0] for key in self.cells if key[1] == indicator})
+        rows = {str(country): self._cell_stats(self.cells[(str(country), indicator, period)])
+                for country in countries if (str(country), indicator, period) in self.cells}
+        table = pd.DataFrame.from_dict(rows, orient='index')
+        table.index.name = self.entity_col
+        return table
+
+    def save(self, path):
+        """Pickles the cube to `path`."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        print(f"Cube saved here: {path}")
+
+    @staticmethod
+    def load(path):
+        """Loads a cube written by `save`."""
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+if __name__ == '__main__':
+    # Example Usage
+    df = pd.read_csv("data/examples/module_3/democracy_gdp.csv")
+    cube = AggregateCube(entity_col='country', time_col='year', bucket_years=10)
+    cube.update(df.query("year < 2015"))
+    cube.update(df)  # only the years from 2015 on are added
+    print(cube.describe('NGDPDPC', countries=['JPN', 'KOR', 'USA']))
+    cube.save("data/intermediate/democracy_gdp_cube.pkl")
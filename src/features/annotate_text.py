@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import requests
+
+
+class AnnotateText:
+    """
+    Batched, concurrent and cached client for an embedding/LLM annotation endpoint.
+
+    Texts are deduplicated by content hash, looked up in a persistent SQLite cache, and
+    only the misses are sent to the model. Misses are packed greedily into batches under a
+    token budget and the batches are sent concurrently. Re-running over the same corpus
+    therefore only costs requests for new or edited documents.
+
+    The endpoint receives `POST {"model", "task", "prompt", "inputs": [...]}` and must
+    answer `{"outputs": [...]}` with one JSON-serializable output per input.
+
+    Attributes:
+        url (str): Model endpoint.
+        model (str): Model name sent with every request; part of the cache key.
+        task (str): 'embed' or 'annotate'; part of the cache key.
+        prompt (str): Instruction sent with annotation requests; part of the cache key.
+        max_batch_tokens (int): Approximate token budget per request.
+        max_batch_size (int): Maximum documents per request.
+        concurrency (int): Number of requests in flight.
+        cache_path (str): SQLite file holding cached outputs.
+        metrics (dict): Counters from the last `annotate` call.
+
+    Methods:
+        annotate(self, texts) -> list
+        annotate_frame(self, df, text_col='text', output_col=None) -> pd.DataFrame
+    """
+    def __init__(self, url="http://127.0.0.1:8765/v1/annotate", model='stub', task='annotate', prompt='',
+                 max_batch_tokens=8000, max_batch_size=64, concurrency=4,
+                 cache_path="data/intermediate/annotation_cache.sqlite", timeout=120):
+        """
+        Initializes AnnotateText.
+
+        Args:
+            url (str, optional): Model endpoint. Defaults to the local stub server.
+            model (str, optional): Model name. Defaults to 'stub'.
+            task (str, optional): 'embed' or 'annotate'. Defaults to 'annotate'.
+            prompt (str, optional): Annotation instruction. Defaults to ''.
+            max_batch_tokens (int, optional): Token budget per request. Defaults to 8000.
+            max_batch_size (int, optional): Documents per request. Defaults to 64.
+            concurrency (int, optional): Requests in flight. Defaults to 4.
+            cache_path (str, optional): SQLite cache file. Defaults to "data/intermediate/annotation_cache.sqlite".
+            timeout (int, optional): Per-request timeout in seconds. Defaults to 120.
+        """
+        self.url = url
+        self.model = model
+        self.task = task
+        self.prompt = prompt
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.concurrency = concurrency
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self.metrics = {}
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        with sqlite3.connect(self.cache_path) as con:
+            con.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, output TEXT)")
+
+    @staticmethod
+    def count_tokens(text):
+        """Cheap token estimate (about four characters per token)."""
+        return len(text) // 4 + 1
+
+    def _key(self, text):
+        payload = '\x1f'.join([self.model, self.task, self.prompt, text])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _cache_get(self, keys):
+        found = {}
+        with sqlite3.connect(self.cache_path) as con:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = con.execute(f"SELECT key, output FROM cache WHERE key IN ({placeholders})", chunk)
+                found.update((key, json.loads(output)) for key, output in rows)
+        return found
+
+    def _cache_put(self, con, items):
+        con.executemany("INSERT OR REPLACE INTO cache (key, output) VALUES (?, ?)",
+                        [(key, json.dumps(output)) for key, output in items])
+        con.commit()
+
+    def _make_batches(self, keys, texts):
+        """Greedily packs (key, text) pairs into batches under the token and size limits."""
+        batches, batch, batch_tokens = [], [], 0
+        for key, text in zip(keys, texts):
+            n_tokens = self.count_tokens(text)
+            if batch and (batch_tokens + n_tokens > self.max_batch_tokens or len(batch) >= self.max_batch_size):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append((key, text))
+            batch_tokens += n_tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _request(self, session, batch):
+        payload = {'model': self.model, 'task': self.task, 'prompt': self.prompt,
+                   'inputs': [text for _, text in batch]}
+        response = session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        outputs = response.json()['outputs']
+        if len(outputs) != len(batch):
+            raise ValueError(f"Endpoint returned {len(outputs)} outputs for {len(batch)} inputs.")
+        return [(key, output) for (key, _), output in zip(batch, outputs)]
+
+    def annotate(self, texts):
+        """
+        Annotates texts, using the cache wherever possible.
+
+        Args:
+            texts (iterable): Documents to annotate. Missing values are treated as ''.
+
+        Returns:
+            list: One output per input text, in input order.
+        """
+        start = time.perf_counter()
+        texts = ['' if pd.isna(text) else str(text) for text in texts]
+        keys = [self._key(text) for text in texts]
+        unique = dict(zip(keys, texts))
+
+        results = self._cache_get(list(unique))
+        missing = [key for key in unique if key not in results]
+        batches = self._make_batches(missing, [unique[key] for key in missing])
+
+        if batches:
+            with requests.Session() as session, sqlite3.connect(self.cache_path) as con, \
+                    ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                futures = [pool.submit(self._request, session, batch) for batch in batches]
+                for future in as_completed(futures):
+                    items = future.result()
+                    results.update(items)
+                    self._cache_put(con, items)
+
+        elapsed = time.perf_counter() - start
+        self.metrics = {
+            'n_texts': len(texts),
+            'n_unique': len(unique),
+            'cache_hits': len(unique) - len(missing),
+            'cache_hit_rate': (len(unique) - len(missing)) / len(unique) if unique else 0.0,
+            'n_requests': len(batches),
+            'n_processed': len(missing),
+            'elapsed_s': elapsed,
+            'texts_per_s': len(texts) / elapsed if elapsed > 0 else float('inf'),
+        }
+        print(f"Annotated {len(texts)} texts ({len(unique)} unique, {self.metrics['cache_hits']} cached) "
+              f"with {len(batches)} requests in {elapsed:.2f}s")
+        return [results[key] for key in keys]
+
+    def annotate_frame(self, df, text_col='text', output_col=None):
+        """
+        Adds the annotations of `df[text_col]` as a new column.
+
+        Args:
+            df (pd.DataFrame): Corpus, e.g. the press-release CSV.
+            text_col (str, optional): Text column. Defaults to 'text'.
+            output_col (str, optional): Output column. Defaults to the task name.
+
+        Returns:
+            pd.DataFrame: Copy of `df` with the output column.
+        """
+        df_out = df.copy()
+        df_out[output_col or self.task] = self.annotate(df_out[text_col])
+        return df_out
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.n_requests += 1
+        self.server.inputs.extend(payload['inputs'])
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if payload.get('task') == 'embed':
+            outputs = [self._embed(text) for text in payload['inputs']]
+        else:
+            outputs = [{'n_words': len(text.split()), 'mentions_emissions': 'emission' in text.lower()}
+                       for text in payload['inputs']]
+        body = json.dumps({'outputs': outputs}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _embed(text, dim=8):
+        digest = hashlib.sha256(text.encode('utf-8')).digest()
+        return [byte / 255 for byte in digest[:dim]]
+
+    def log_message(self, *args):
+        pass
+
+
+class StubModelServer:
+    """
+    Local stand-in for a model endpoint, for running `AnnotateText` without network access.
+
+    'embed' requests get a deterministic 8-dimensional vector per text, other tasks get a
+    small dict of word-count annotations. `delay` simulates model latency per request.
+    `n_requests` and `inputs` record what the server received.
+
+    Usage:
+        with StubModelServer(port=8765) as server:
+            AnnotateText(url=server.url).annotate(texts)
+    """
+    def __init__(self, host='127.0.0.1', port=8765, delay=0.05):
+        self.httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self.httpd.delay = delay
+        self.httpd.n_requests = 0
+        self.httpd.inputs = []
+        self.url = f"http://{host}:{self.httpd.server_address[1]}/v1/annotate"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def n_requests(self):
+        return self.httpd.n_requests
+
+    @property
+    def inputs(self):
+        """Every text received so far, in arrival order."""
+        return self.httpd.inputs
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == '__main__':
+    # Example Usage
+    df = pd.read_csv("data/examples/module_4/eu_press_releases_ghg.csv")
+    with StubModelServer(port=0) as server:
+        annotator = AnnotateText(url=server.url, max_batch_tokens=2000, concurrency=4)
+        df_annotated = annotator.annotate_frame(df)
+        print(annotator.metrics)
+        # Second run is served from the cache
+        annotator.annotate_frame(df)
+        print(annotator.metrics)
+        print(f"Stub server handled {server.n_requests} requests")
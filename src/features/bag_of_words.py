@@ -0,0 +1,233 @@
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.features.stream_text import StreamText
+
+
+class BagOfWords:
+    """
+    Builds bag-of-words / TF-IDF features as CSR matrices and stores them memory-mapped.
+
+    Two vocabulary modes:
+        'pruned': a first streaming pass counts document frequencies, terms outside
+                  [min_df, max_df] are dropped, and a second pass fills the matrix.
+        'hashed': a single pass through `StreamText.iter_matrices`; no vocabulary is kept.
+
+    Either way only one batch of text is in memory at a time; the matrix is assembled from
+    flat index/count arrays, never from a dense frame.
+
+    Attributes:
+        mode (str): 'pruned' or 'hashed'.
+        min_df (int or float): Minimum document frequency (count, or share if float).
+        max_df (int or float): Maximum document frequency (count, or share if float).
+        max_features (int): Keep only the most frequent terms after pruning (None keeps all).
+        tfidf (bool): Apply TF-IDF weighting and L2 row normalization.
+        sublinear_tf (bool): Use 1 + log(tf) instead of raw counts.
+        vocabulary (dict): term -> column (pruned mode only).
+        idf (np.ndarray): Inverse document frequencies from the last fit.
+
+    Methods:
+        fit_transform(self, stream) -> sp.csr_matrix
+        save(self, matrix, out_dir) -> None
+        load(out_dir, mmap=True) -> sp.csr_matrix
+    """
+    def __init__(self, mode='pruned', min_df=2, max_df=0.95, max_features=None, tfidf=True, sublinear_tf=False):
+        """
+        Initializes BagOfWords.
+
+        Args:
+            mode (str, optional): 'pruned' or 'hashed'. Defaults to 'pruned'.
+            min_df (int or float, optional): Minimum document frequency. Defaults to 2.
+            max_df (int or float, optional): Maximum document frequency. Defaults to 0.95.
+            max_features (int, optional): Vocabulary cap. Defaults to None.
+            tfidf (bool, optional): Apply TF-IDF weighting. Defaults to True.
+            sublinear_tf (bool, optional): Log-scale term frequencies. Defaults to False.
+        """
+        if mode not in ('pruned', 'hashed'):
+            raise ValueError("mode must be 'pruned' or 'hashed'.")
+        self.mode = mode
+        self.min_df = min_df
+        self.max_df = max_df
+        self.max_features = max_features
+        self.tfidf = tfidf
+        self.sublinear_tf = sublinear_tf
+        self.vocabulary = None
+        self.idf = None
+
+    def _fit_vocabulary(self, stream):
+        doc_freq = Counter()
+        n_docs = 0
+        for _, tokens in stream.iter_tokens():
+            for doc in tokens:
+                doc_freq.update(set(doc))
+            n_docs += len(tokens)
+
+        min_count = self.min_df * n_docs if isinstance(self.min_df, float) else self.min_df
+        max_count = self.max_df * n_docs if isinstance(self.max_df, float) else self.max_df
+        terms = [(term, df) for term, df in doc_freq.items() if min_count <= df <= max_count]
+        if self.max_features is not None:
+            terms = sorted(terms, key=lambda item: (-item[1], item[0]))[:self.max_features]
+        self.vocabulary = {term: i for i, term in enumerate(sorted(term for term, _ in terms))}
+        print(f"Vocabulary: kept {len(self.vocabulary)} of {len(doc_freq)} terms from {n_docs} documents")
+
+    def _count_pruned(self, stream):
+        vocab = self.vocabulary
+        indptr, indices, counts = [np.zeros(1, dtype=np.int64)], [], []
+        n_entries = 0
+        for _, tokens in stream.iter_tokens():
+            batch_indptr = np.empty(len(tokens), dtype=np.int64)
+            for i, doc in enumerate(tokens):
+                doc_counts = Counter(vocab[token] for token in doc if token in vocab)
+                indices.append(np.fromiter(doc_counts.keys(), dtype=np.int32, count=len(doc_counts)))
+                counts.append(np.fromiter(doc_counts.values(), dtype=np.float32, count=len(doc_counts)))
+                n_entries += len(doc_counts)
+                batch_indptr[i] = n_entries
+            indptr.append(batch_indptr)
+        matrix = sp.csr_matrix(
+            (np.concatenate(counts) if counts else np.array([], dtype=np.float32),
+             np.concatenate(indices) if indices else np.array([], dtype=np.int32),
+             np.concatenate(indptr)),
+            shape=(sum(len(part) for part in indptr) - 1, len(vocab)),
+        )
+        matrix.sort_indices()
+        return matrix
+
+    def _count_hashed(self, stream):
+        matrix = sp.vstack([m for _, m in stream.iter_matrices()], format='csr').astype(np.float32)
+        matrix.sort_indices()
+        return matrix
+
+    def _apply_tfidf(self, matrix):
+        """TF-IDF with smoothed idf and L2 row norms, computed directly on the CSR arrays."""
+        n_docs = matrix.shape[0]
+        doc_freq = np.bincount(matrix.indices, minlength=matrix.shape[1])
+        self.idf = (np.log((1 + n_docs) / (1 + doc_freq)) + 1).astype(np.float32)
+        if self.sublinear_tf:
+            np.log(matrix.data, out=matrix.data)
+            matrix.data += 1
+        matrix.data *= self.idf[matrix.indices]
+        row_ids = np.repeat(np.arange(n_docs), np.diff(matrix.indptr))
+        norms = np.sqrt(np.bincount(row_ids, weights=matrix.data ** 2, minlength=n_docs)).astype(np.float32)
+        norms[norms == 0] = 1
+        matrix.data /= norms[row_ids]
+        return matrix
+
+    def fit_transform(self, stream):
+        """
+        Builds the document-term matrix for a corpus.
+
+        Args:
+            stream (StreamText): Corpus stream (see `src.features.stream_text`).
+
+        Returns:
+            sp.csr_matrix: float32 matrix of shape (n_docs, n_terms).
+        """
+        if self.mode == 'pruned':
+            self._fit_vocabulary(stream)
+            matrix = self._count_pruned(stream)
+        else:
+            matrix = self._count_hashed(stream)
+        if self.tfidf:
+            matrix = self._apply_tfidf(matrix)
+        return matrix
+
+    def save(self, matrix, out_dir):
+        """
+        Writes the CSR arrays as .npy files so they can be memory-mapped by `load`.
+
+        Args:
+            matrix (sp.csr_matrix): Matrix from `fit_transform`.
+            out_dir (str): Output directory.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        for name in ('data', 'indices', 'indptr'):
+            np.save(os.path.join(out_dir, f'{name}.npy'), getattr(matrix, name))
+        meta = {'shape': list(matrix.shape), 'mode': self.mode}
+        with open(os.path.join(out_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        if self.vocabulary is not None:
+            with open(os.path.join(out_dir, 'vocabulary.json'), 'w') as f:
+                json.dump(self.vocabulary, f)
+        if self.idf is not None:
+            np.save(os.path.join(out_dir, 'idf.npy'), self.idf)
+        print(f"Saved {matrix.shape[0]}x{matrix.shape[1]} matrix ({matrix.nnz} non-zeros) here: {out_dir}")
+
+    @staticmethod
+    def load(out_dir, mmap=True):
+        """
+        Loads a matrix written by `save`.
+
+        With `mmap=True` the CSR arrays are read-only views on the files, so regressions and
+        classifiers can use the matrix without reading it into memory first.
+
+        Args:
+            out_dir (str): Directory written by `save`.
+            mmap (bool, optional): Memory-map instead of reading. Defaults to True.
+
+        Returns:
+            sp.csr_matrix: The stored matrix.
+        """
+        mmap_mode = 'r' if mmap else None
+        arrays = [np.load(os.path.join(out_dir, f'{name}.npy'), mmap_mode=mmap_mode) for name in ('data', 'indices', 'indptr')]
+        with open(os.path.join(out_dir, 'meta.json')) as f:
+            meta = json.load(f)
+        return sp.csr_matrix(tuple(arrays), shape=tuple(meta['shape']), copy=False)
+
+
+def benchmark(file_path="data/examples/module_4/eu_press_releases_ghg.csv", scale=100, mode='pruned', n_jobs=4):
+    """
+    Times fit/save/load on the press-release corpus repeated `scale` times.
+
+    Args:
+        file_path (str, optional): Source corpus. Defaults to the press-release CSV.
+        scale (int, optional): Number of copies of the corpus. Defaults to 100.
+        mode (str, optional): BagOfWords mode. Defaults to 'pruned'.
+        n_jobs (int, optional): Tokenizer processes. Defaults to 4.
+
+    Returns:
+        dict: Timings in seconds and matrix size.
+    """
+    df = pd.read_csv(file_path)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_path = os.path.join(tmp_dir, 'corpus.csv')
+        for i in range(scale):
+            df.to_csv(corpus_path, mode='a', header=(i == 0), index=False)
+
+        stream = StreamText(file_path=corpus_path, batch_size=2000, n_jobs=n_jobs)
+        bow = BagOfWords(mode=mode)
+        start = time.perf_counter()
+        matrix = bow.fit_transform(stream)
+        fit_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bow.save(matrix, os.path.join(tmp_dir, 'bow'))
+        save_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = BagOfWords.load(os.path.join(tmp_dir, 'bow'))
+        row_sums = np.asarray(loaded.sum(axis=1)).ravel()
+        load_s = time.perf_counter() - start
+
+    results = {'n_docs': matrix.shape[0], 'n_terms': matrix.shape[1], 'nnz': matrix.nnz,
+               'matrix_mb': (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 1e6,
+               'fit_s': fit_s, 'save_s': save_s, 'load_and_sum_s': load_s, 'rows_summed': len(row_sums)}
+    print(results)
+    return results
+
+
+if __name__ == '__main__':
+    # Example Usage
+    bow = BagOfWords(mode='pruned', min_df=2, max_df=0.9)
+    matrix = bow.fit_transform(StreamText(n_jobs=1))
+    bow.save(matrix, "data/intermediate/press_bow")
+    print(BagOfWords.load("data/intermediate/press_bow"))
+
+    # Scaling benchmark: 100 copies of the press-release corpus
+    benchmark(scale=100)
@@ -53,10 +53,10 @@ class GenerateFeatures:
         # Determine group key for 'country'
         if 'country' in df_out.columns:
             group_key = df_out['country']
-            group_obj = df_out.groupby('country')
+            group_obj = df_out.groupby('country', observed=True)
         elif 'country' in df_out.index.names:
             group_key = df_out.index.get_level_values('country')
-            group_obj = df_out.groupby(level='country')
+            group_obj = df_out.groupby(level='country', observed=True)
         else:
             raise ValueError("DataFrame must have 'country' as a column or index level.")
 
@@ -80,7 +80,7 @@ class GenerateFeatures:
             df_out = pd.concat([df_out, df_ma], axis=1)
 
             # 4. Change in moving average
-            df_ma_diff = df_ma.groupby(group_key).diff()
+            df_ma_diff = df_ma.groupby(group_key, observed=True).diff()
             df_ma_diff.columns = [f"{col}_chg{self.time_period}" for col in df_ma_diff.columns]
             df_out = pd.concat([df_out, df_ma_diff], axis=1)
 
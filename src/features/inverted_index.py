@@ -0,0 +1,389 @@
+import json
+import os
+import pickle
+import re
+import shlex
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from src.features.stream_text import StreamText, normalize_tokenize
+
+# Unlike the bag-of-words pattern, keep numbers and single characters: years ("2030"),
+# targets ("55" in "fit for 55") and phrase positions all depend on them
+INDEX_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def encode_varints(numbers):
+    """Encodes non-negative integers as LEB128 varints (vectorized with numpy)."""
+    values = np.asarray(numbers, dtype=np.uint64).ravel()
+    if len(values) == 0:
+        return b''
+    n_bytes = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        n_bytes += rest > 0
+        rest >>= np.uint64(7)
+    owner = np.repeat(np.arange(len(values)), n_bytes)
+    byte_pos = np.arange(owner.size) - np.repeat(np.cumsum(n_bytes) - n_bytes, n_bytes)
+    out = (values[owner] >> (np.uint64(7) * byte_pos.astype(np.uint64))) & np.uint64(0x7F)
+    out[byte_pos < n_bytes[owner] - 1] |= np.uint64(0x80)
+    return out.astype(np.uint8).tobytes()
+
+
+def decode_varints(data):
+    """Decodes LEB128 varints (bytes or a uint8 array) into an int64 array, without a Python loop."""
+    if isinstance(data, (bytes, bytearray)):
+        data = np.frombuffer(data, dtype=np.uint8)
+    data = np.asarray(data, dtype=np.uint8)
+    if len(data) == 0:
+        return np.array([], dtype=np.int64)
+    is_last = (data & 0x80) == 0
+    ends = np.flatnonzero(is_last)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    owner = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    byte_pos = np.arange(len(data)) - starts[owner]
+    chunks = (data & 0x7F).astype(np.int64) << (7 * byte_pos)
+    return np.add.reduceat(chunks, starts)
+
+
+def encode_postings(doc_ids, positions):
+    """
+    Packs a posting list into bytes.
+
+    Layout: all doc id gaps, then all term frequencies, then the position gaps of every
+    document (restarting at each document). Gaps keep the integers small so most of them
+    fit in a single byte, and keeping doc ids and positions in separate blocks lets
+    boolean queries decode only the doc ids.
+
+    Args:
+        doc_ids (list): Sorted document ids.
+        positions (list): One sorted list of token positions per document.
+
+    Returns:
+        tuple: (bytes, length of the doc id + frequency block in bytes).
+    """
+    doc_ids = np.asarray(doc_ids, dtype=np.int64)
+    tfs = np.array([len(pos) for pos in positions], dtype=np.int64)
+    flat = np.concatenate([np.asarray(pos, dtype=np.int64) for pos in positions])
+    gaps = np.diff(flat, prepend=0)
+    gaps[np.cumsum(tfs) - tfs] = flat[np.cumsum(tfs) - tfs]
+    head = encode_varints(np.concatenate([np.diff(doc_ids, prepend=0), tfs]))
+    return head + encode_varints(gaps), len(head)
+
+
+def decode_postings(data, n_docs, head_len=None):
+    """
+    Inverse of `encode_postings`.
+
+    Args:
+        data (bytes or np.ndarray): Encoded posting list.
+        n_docs (int): Number of documents in the list.
+        head_len (int, optional): Length of the doc id block; if given, positions are decoded too.
+
+    Returns:
+        tuple: (doc_ids, tfs, positions) arrays; `positions` is the concatenation of every
+            document's positions (None when `head_len` is not given).
+    """
+    head = decode_varints(data if head_len is None else data[:head_len])
+    doc_ids, tfs = np.cumsum(head[:n_docs]), head[n_docs:2 * n_docs]
+    if head_len is None:
+        return doc_ids, tfs, None
+    gaps = decode_varints(data[head_len:])
+    running = np.cumsum(gaps)
+    doc_starts = np.cumsum(tfs) - tfs
+    # Positions restart at every document: subtract the running total before each document's first gap
+    base = running[doc_starts] - gaps[doc_starts]
+    return doc_ids, tfs, running - np.repeat(base, tfs)
+
+
+class InvertedIndex:
+    """
+    On-disk positional inverted index with a date index for a text corpus.
+
+    Every call to `add_documents` writes one immutable segment: a bytes file with all
+    compressed posting lists, memory-mapped when the index is opened, and a small term
+    dictionary (term -> byte offsets and document count). Document dates are appended to
+    one `dates.bin` file, also memory-mapped, so opening the index reads neither postings
+    nor dates into RAM and adding documents never rebuilds what is already indexed.
+    Queries decode posting lists into numpy arrays and combine them with sorted-array
+    intersections; phrases are matched by intersecting (doc id, start position) keys.
+    `compact` merges segments when there are many of them.
+
+    Query syntax for `search`:
+        climate emissions          both terms (AND)
+        climate OR wildfire        either clause
+        emissions -aviation        exclude a term
+        "green deal"               phrase
+
+    Attributes:
+        index_dir (str): Directory holding `meta.json`, `dates.bin` and the segment files.
+        n_docs (int): Number of indexed documents; the next document gets this id.
+        doc_dates (np.ndarray): Date of every document, indexed by doc id (memory-mapped).
+
+    Methods:
+        add_documents(self, dates, texts) -> int
+        add_csv(self, file_path, **stream_kwargs) -> int
+        postings(self, term, positions=False) -> tuple
+        search(self, query, date_start=None, date_end=None) -> pd.DataFrame
+        compact(self) -> None
+    """
+    FORMAT = 3
+
+    def __init__(self, index_dir="data/intermediate/press_index"):
+        """
+        Opens an existing index or creates an empty one.
+
+        Args:
+            index_dir (str, optional): Index directory. Defaults to "data/intermediate/press_index".
+        """
+        self.index_dir = index_dir
+        os.makedirs(self.index_dir, exist_ok=True)
+        self.meta_path = os.path.join(self.index_dir, 'meta.json')
+        self.dates_path = os.path.join(self.index_dir, 'dates.bin')
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            if meta.get('format') != self.FORMAT:
+                raise ValueError(f"{self.index_dir} was written by an older InvertedIndex; delete it and re-index.")
+        else:
+            meta = {'n_docs': 0, 'segments': []}
+        self.n_docs = meta['n_docs']
+        self.segment_names = meta['segments']
+        self.segments = [self._open_segment(name) for name in self.segment_names]
+        self._map_dates()
+
+    def _open_segment(self, name):
+        """Loads a segment's term dictionary and memory-maps its posting bytes."""
+        with open(os.path.join(self.index_dir, f'{name}.terms'), 'rb') as f:
+            terms = pickle.load(f)
+        post_path = os.path.join(self.index_dir, f'{name}.post')
+        data = np.memmap(post_path, dtype=np.uint8, mode='r') if os.path.getsize(post_path) else np.empty(0, np.uint8)
+        return {'terms': terms, 'data': data}
+
+    def _write_segment(self, name, postings):
+        """Writes {term: (doc_ids, positions)} as a segment and returns it opened."""
+        terms, offset = {}, 0
+        with open(os.path.join(self.index_dir, f'{name}.post'), 'wb') as f:
+            for term, (doc_ids, positions) in postings.items():
+                data, head_len = encode_postings(doc_ids, positions)
+                f.write(data)
+                terms[term] = (offset, offset + head_len, offset + len(data), len(doc_ids))
+                offset += len(data)
+        with open(os.path.join(self.index_dir, f'{name}.terms'), 'wb') as f:
+            pickle.dump(terms, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return self._open_segment(name)
+
+    def _remove_segment_files(self, name):
+        for ext in ('.post', '.terms'):
+            os.remove(os.path.join(self.index_dir, name + ext))
+
+    def _write_meta(self):
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'format': self.FORMAT, 'n_docs': self.n_docs, 'segments': self.segment_names}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _map_dates(self):
+        # Only the first n_docs dates count: an interrupted add may have appended more
+        if self.n_docs:
+            self.doc_dates = np.memmap(self.dates_path, dtype='datetime64[D]', mode='r', shape=(self.n_docs,))
+        else:
+            self.doc_dates = np.array([], dtype='datetime64[D]')
+
+    def add_documents(self, dates, texts):
+        """
+        Indexes a batch of documents as a new segment.
+
+        Args:
+            dates (array-like): Document dates (anything `pd.to_datetime` accepts).
+            texts (iterable): Raw texts, or lists of tokens already normalized with `INDEX_TOKEN_PATTERN`.
+
+        Returns:
+            int: Number of documents added.
+        """
+        dates = pd.to_datetime(pd.Series(dates)).to_numpy().astype('datetime64[D]')
+        postings = defaultdict(lambda: ([], []))
+        first_doc = self.n_docs
+        n_added = 0
+        for offset, text in enumerate(texts):
+            tokens = text if isinstance(text, list) else normalize_tokenize(text, INDEX_TOKEN_PATTERN)
+            positions = defaultdict(list)
+            for pos, token in enumerate(tokens):
+                positions[token].append(pos)
+            for token, pos_list in positions.items():
+                postings[token][0].append(first_doc + offset)
+                postings[token][1].append(pos_list)
+            n_added += 1
+        if n_added != len(dates):
+            raise ValueError("dates and texts must have the same length.")
+        if n_added == 0:
+            return 0
+
+        name = f'segment_{first_doc:09d}'
+        self.segments.append(self._write_segment(name, postings))
+        self.segment_names.append(name)
+        # The date index grows by appending; rows already on disk are never rewritten
+        with open(self.dates_path, 'r+b' if os.path.exists(self.dates_path) else 'wb') as f:
+            f.seek(first_doc * dates.itemsize)
+            f.write(dates.tobytes())
+        self.n_docs += n_added
+        self._write_meta()
+        self._map_dates()
+        return n_added
+
+    def add_csv(self, file_path, **stream_kwargs):
+        """
+        Streams a CSV corpus through `StreamText` and indexes it one batch per segment.
+
+        Args:
+            file_path (str): CSV with a date and a text column.
+            **stream_kwargs: Passed on to `StreamText` (text_col, date_format, batch_size, n_jobs, ...).
+
+        Returns:
+            int: Number of documents added.
+        """
+        stream = StreamText(file_path=file_path, token_pattern=INDEX_TOKEN_PATTERN, **stream_kwargs)
+        n_added = 0
+        for dates, tokens in stream.iter_tokens():
+            n_added += self.add_documents(dates, tokens)
+        print(f"Indexed {n_added} documents from {file_path} ({len(self.segments)} segments)")
+        return n_added
+
+    def compact(self):
+        """Merges all segments into one, dropping the old segment files."""
+        if len(self.segments) <= 1:
+            return
+        vocabulary = set().union(*(segment['terms'] for segment in self.segments))
+        merged = {}
+        for term in vocabulary:
+            doc_ids, tfs, flat = self.postings(term, positions=True)
+            merged[term] = (doc_ids, np.split(flat, np.cumsum(tfs)[:-1]))
+        old_names = self.segment_names
+        name = f'segment_compact_{self.n_docs:09d}'
+        self.segments, self.segment_names = [self._write_segment(name, merged)], [name]
+        self._write_meta()
+        for old in old_names:
+            self._remove_segment_files(old)
+
+    def postings(self, term, positions=False):
+        """
+        Returns the posting list of a normalized term across all segments.
+
+        Args:
+            term (str): Normalized term.
+            positions (bool, optional): Also decode token positions. Defaults to False.
+
+        Returns:
+            tuple: (doc_ids, tfs, positions) int64 arrays sorted by doc id; `positions` holds
+                every document's positions back to back (None unless requested).
+        """
+        parts = []
+        for segment in self.segments:
+            entry = segment['terms'].get(term)
+            if entry is not None:
+                start, head_end, end, n_docs = entry
+                parts.append(decode_postings(segment['data'][start:end], n_docs, head_end - start if positions else None))
+        if not parts:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, empty if positions else None
+        # Segments cover increasing doc id ranges, so concatenating keeps everything sorted
+        doc_ids, tfs = np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+        return doc_ids, tfs, np.concatenate([p[2] for p in parts]) if positions else None
+
+    def _match_phrase(self, tokens):
+        if not tokens:
+            return np.array([], dtype=np.int64)
+        if len(tokens) == 1:
+            return self.postings(tokens[0])[0]
+        candidates = None
+        for token in tokens:
+            doc_ids = self.postings(token)[0]
+            candidates = doc_ids if candidates is None else np.intersect1d(candidates, doc_ids, assume_unique=True)
+        if len(candidates) == 0:
+            return candidates
+        # A phrase starts at p in doc d when token i occurs at p + i; intersect (d, p) keys across tokens
+        starts = None
+        for i, token in enumerate(tokens):
+            doc_ids, tfs, positions = self.postings(token, positions=True)
+            owner = np.repeat(doc_ids, tfs)
+            keep = np.isin(owner, candidates, assume_unique=False) & (positions >= i)
+            keys = (owner[keep] << 32) | (positions[keep] - i)
+            starts = keys if starts is None else np.intersect1d(starts, keys, assume_unique=True)
+        return np.unique(starts >> 32)
+
+    def _match_clause(self, parts, universe):
+        include, exclude, ignored = None, [], []
+        for part in parts:
+            negate = part.startswith('-')
+            tokens = normalize_tokenize(part.lstrip('-'), INDEX_TOKEN_PATTERN)
+            if not tokens:
+                # Pure punctuation has nothing to match; skip it instead of matching no documents
+                ignored.append(part)
+                continue
+            docs = self._match_phrase(tokens)
+            if negate:
+                exclude.append(docs)
+            elif include is None:
+                include = docs
+            else:
+                include = np.intersect1d(include, docs, assume_unique=True)
+        if ignored:
+            print(f"Ignoring query terms without indexable tokens: {ignored}")
+        if include is None:
+            if not exclude:
+                return np.array([], dtype=np.int64)
+            # Negation-only clause: start from every document that passes the date filter
+            include = universe()
+        if exclude:
+            include = include[~np.isin(include, np.concatenate(exclude))]
+        return include
+
+    def _date_mask(self, doc_ids, date_start, date_end):
+        dates = self.doc_dates[doc_ids]
+        mask = np.ones(len(doc_ids), dtype=bool)
+        if date_start is not None:
+            mask &= dates >= np.datetime64(pd.Timestamp(date_start), 'D')
+        if date_end is not None:
+            mask &= dates <= np.datetime64(pd.Timestamp(date_end), 'D')
+        return mask
+
+    def search(self, query, date_start=None, date_end=None):
+        """
+        Runs a boolean/phrase query with an optional inclusive date range.
+
+        Args:
+            query (str): Query string (see class docstring for the syntax).
+            date_start (str, optional): Earliest document date, e.g. '2025-01-01'.
+            date_end (str, optional): Latest document date.
+
+        Returns:
+            pd.DataFrame: Matching `doc_id` and `date`, sorted by doc_id.
+        """
+        clauses, current = [], []
+        for part in shlex.split(query):
+            if part == 'OR':
+                clauses.append(current)
+                current = []
+            else:
+                current.append(part)
+        clauses.append(current)
+
+        def universe():
+            all_docs = np.arange(self.n_docs, dtype=np.int64)
+            return all_docs[self._date_mask(all_docs, date_start, date_end)]
+
+        matches = [self._match_clause(clause, universe) for clause in clauses if clause]
+        doc_ids = np.unique(np.concatenate(matches)) if matches else np.array([], dtype=np.int64)
+        # Dates are looked up per match, so the filter costs O(matches) rather than O(corpus)
+        doc_ids = doc_ids[self._date_mask(doc_ids, date_start, date_end)]
+        return pd.DataFrame({'doc_id': doc_ids, 'date': np.asarray(self.doc_dates[doc_ids])})
+
+
+if __name__ == '__main__':
+    # Example Usage
+    index = InvertedIndex()
+    if index.n_docs == 0:
+        index.add_csv("data/examples/module_4/eu_press_releases_ghg.csv", n_jobs=1)
+    print(index.search('"greenhouse gas" OR emissions -aviation', date_start='2025-01-01'))
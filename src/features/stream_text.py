@@ -0,0 +1,182 @@
+import re
+import unicodedata
+from functools import partial
+from multiprocessing import Pool
+
+import pandas as pd
+import scipy.sparse as sp
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9]+")
+
+
+def normalize_tokenize(text, pattern=TOKEN_PATTERN):
+    """
+    Lower-cases, strips accents and splits a document into word tokens.
+
+    Kept at module level so it can be pickled and sent to worker processes.
+
+    Args:
+        text (str): Raw document text.
+        pattern (re.Pattern, optional): Token regex. Defaults to `TOKEN_PATTERN` (at least two
+            characters, starting with a letter).
+
+    Returns:
+        list: Normalized tokens.
+    """
+    if not isinstance(text, str):
+        return []
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = text.encode('ascii', 'ignore').decode('ascii')
+    return pattern.findall(text)
+
+
+def _tokenize_batch(texts, pattern=TOKEN_PATTERN):
+    return [normalize_tokenize(text, pattern) for text in texts]
+
+
+def _identity(tokens):
+    return tokens
+
+
+class StreamText:
+    """
+    Streams a text corpus from CSV and turns it into a sparse document-term matrix batch by batch.
+
+    Documents are read with `pd.read_csv(chunksize=...)`, so only one batch of raw text is
+    held in memory at a time. Dates are parsed once per batch into datetime64, tokenization
+    runs in a multiprocessing pool, and a stateless HashingVectorizer turns every batch into
+    a CSR matrix with a fixed number of columns, so batches can be stacked or consumed one
+    at a time without a vocabulary pass.
+
+    Attributes:
+        file_path (str): Path to the CSV corpus.
+        text_col (str): Column holding the document text.
+        date_col (str): Column holding the document date.
+        date_format (str): strftime format of the date column ('May_26_2025' -> '%b_%d_%Y').
+        batch_size (int): Number of documents per batch.
+        n_features (int): Number of hashed columns in the document-term matrix.
+        n_jobs (int): Number of worker processes used for tokenization.
+        token_pattern (re.Pattern): Token regex passed to `normalize_tokenize`.
+
+    Methods:
+        iter_batches(self) -> generator of pd.DataFrame
+        iter_tokens(self) -> generator of (pd.Series, list)
+        iter_matrices(self) -> generator of (pd.Series, sp.csr_matrix)
+        transform(self) -> (pd.Series, sp.csr_matrix)
+    """
+    def __init__(self, file_path="data/examples/module_4/eu_press_releases_ghg.csv", text_col='text',
+                 date_col='date', date_format='%b_%d_%Y', batch_size=1000, n_features=2**20, n_jobs=4,
+                 token_pattern=TOKEN_PATTERN):
+        """
+        Initializes StreamText.
+
+        Args:
+            file_path (str, optional): Path to the CSV corpus.
+                Defaults to "data/examples/module_4/eu_press_releases_ghg.csv".
+            text_col (str, optional): Text column. Defaults to 'text'.
+            date_col (str, optional): Date column. Defaults to 'date'.
+            date_format (str, optional): Format of the date strings. Defaults to '%b_%d_%Y'.
+            batch_size (int, optional): Documents per batch. Defaults to 1000.
+            n_features (int, optional): Hashed vocabulary size. Defaults to 2**20.
+            n_jobs (int, optional): Tokenizer processes; 1 disables multiprocessing. Defaults to 4.
+            token_pattern (re.Pattern, optional): Token regex. Defaults to `TOKEN_PATTERN`.
+        """
+        self.file_path = file_path
+        self.text_col = text_col
+        self.date_col = date_col
+        self.date_format = date_format
+        self.batch_size = batch_size
+        self.n_features = n_features
+        self.n_jobs = n_jobs
+        self.token_pattern = token_pattern
+        self._vectorizer = None
+
+    @property
+    def vectorizer(self):
+        """HashingVectorizer, created on first use so tokenizer-only callables do not import sklearn."""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(
+                n_features=self.n_features,
+                analyzer=_identity,
+                alternate_sign=False,
+                norm=None,
+            )
+        return self._vectorizer
+
+    def iter_batches(self):
+        """
+        Reads the corpus in chunks and parses the date column once per chunk.
+
+        Yields:
+            pd.DataFrame: A batch with a datetime64 date column and a string text column.
+        """
+        reader = pd.read_csv(
+            self.file_path,
+            usecols=[self.date_col, self.text_col],
+            dtype={self.date_col: 'string', self.text_col: 'string'},
+            chunksize=self.batch_size,
+        )
+        for chunk in reader:
+            chunk[self.date_col] = pd.to_datetime(chunk[self.date_col], format=self.date_format, errors='coerce')
+            yield chunk
+
+    def iter_tokens(self):
+        """
+        Tokenizes every batch, spreading the work over a process pool.
+
+        Each batch is split into `n_jobs` slices so workers receive one pickled list
+        per slice rather than one message per document.
+
+        Yields:
+            tuple: (dates, tokens) where dates is a datetime64 Series and tokens a list of token lists.
+        """
+        tokenize = partial(_tokenize_batch, pattern=self.token_pattern)
+        if self.n_jobs <= 1:
+            for batch in self.iter_batches():
+                yield batch[self.date_col], tokenize(batch[self.text_col].tolist())
+            return
+
+        with Pool(processes=self.n_jobs) as pool:
+            for batch in self.iter_batches():
+                texts = batch[self.text_col].tolist()
+                step = max(1, -(-len(texts) // self.n_jobs))
+                slices = [texts[i:i + step] for i in range(0, len(texts), step)]
+                tokens = [doc for part in pool.map(tokenize, slices) for doc in part]
+                yield batch[self.date_col], tokens
+
+    def iter_matrices(self):
+        """
+        Hashes each tokenized batch into a sparse document-term matrix.
+
+        Yields:
+            tuple: (dates, matrix) where matrix is a CSR matrix of shape (batch, n_features).
+        """
+        for dates, tokens in self.iter_tokens():
+            yield dates, self.vectorizer.transform(tokens).tocsr()
+
+    def transform(self):
+        """
+        Consumes the whole stream and stacks the batches.
+
+        Only the sparse matrices are kept, never the raw text, so memory grows with the
+        number of non-zero terms rather than the size of the corpus.
+
+        Returns:
+            tuple: (dates, matrix) covering every document in file order.
+        """
+        dates, matrices = [], []
+        for batch_dates, matrix in self.iter_matrices():
+            dates.append(batch_dates)
+            matrices.append(matrix)
+        if not matrices:
+            return pd.Series([], dtype='datetime64[ns]'), sp.csr_matrix((0, self.n_features))
+        return pd.concat(dates, ignore_index=True), sp.vstack(matrices, format='csr')
+
+
+if __name__ == '__main__':
+    # Example Usage
+    stream = StreamText(batch_size=500, n_jobs=2)
+    for dates, matrix in stream.iter_matrices():
+        print(f"Batch: {matrix.shape[0]} documents, {matrix.nnz} non-zero terms, "
+              f"{dates.min().date()} to {dates.max().date()}")
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def demean(Z, codes, n_groups):
+    """
+    Subtracts group means from every column of Z.
+
+    Group sums come from `np.bincount`, so the cost is one pass over the data per column
+    and no dummy matrix is ever built.
+
+    Args:
+        Z (np.ndarray): (n, k) array.
+        codes (np.ndarray): Integer group code per row (0..n_groups-1).
+        n_groups (int): Number of groups.
+
+    Returns:
+        np.ndarray: Within-transformed copy of Z.
+    """
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = np.column_stack([np.bincount(codes, weights=Z[:, j], minlength=n_groups) for j in range(Z.shape[1])])
+    return Z - (sums / np.maximum(counts, 1)[:, None])[codes]
+
+
+class PanelRegression:
+    """
+    OLS with one- or two-way fixed effects absorbed by demeaning.
+
+    Equivalent to `smf.ols('y ~ x + C(country)')` (or `+ C(country) + C(date)`), but the
+    fixed effects are swept out of y and X instead of being added as dummy columns. One-way
+    effects need a single demeaning; two-way effects use alternating projections (demean by
+    entity, then by time, repeat until the data stop changing). Coefficients, standard
+    errors and degrees of freedom match the dummy-variable regression in statsmodels.
+
+    Attributes:
+        entity_col (str): Entity identifier, e.g. 'country'.
+        time_col (str): Time identifier, e.g. 'date'.
+        effects (str): 'entity', 'time' or 'twoway'.
+        cov_type (str): 'nonrobust', 'HC1' or 'cluster'.
+        cluster_col (str): Column to cluster on; defaults to `entity_col`.
+        tol (float): Convergence tolerance for alternating projections, relative to each column's largest value.
+        max_iter (int): Iteration cap for alternating projections.
+        params (pd.Series): Slope coefficients after `fit`.
+        results (pd.DataFrame): coef, std_err, t, pvalue and 95% interval per regressor.
+
+    Methods:
+        fit(self, df, y_col, x_cols) -> pd.DataFrame
+    """
+    def __init__(self, entity_col='country', time_col='date', effects='entity', cov_type='nonrobust',
+                 cluster_col=None, tol=1e-10, max_iter=1000):
+        """
+        Initializes PanelRegression.
+
+        Args:
+            entity_col (str, optional): Entity column or index level. Defaults to 'country'.
+            time_col (str, optional): Time column or index level. Defaults to 'date'.
+            effects (str, optional): 'entity', 'time' or 'twoway'. Defaults to 'entity'.
+            cov_type (str, optional): 'nonrobust', 'HC1' or 'cluster'. Defaults to 'nonrobust'.
+            cluster_col (str, optional): Cluster column. Defaults to `entity_col`.
+            tol (float, optional): Relative alternating-projection tolerance. Defaults to 1e-10.
+            max_iter (int, optional): Alternating-projection iteration cap. Defaults to 1000.
+        """
+        if effects not in ('entity', 'time', 'twoway'):
+            raise ValueError("effects must be 'entity', 'time' or 'twoway'.")
+        if cov_type not in ('nonrobust', 'HC1', 'cluster'):
+            raise ValueError("cov_type must be 'nonrobust', 'HC1' or 'cluster'.")
+        self.entity_col = entity_col
+        self.time_col = time_col
+        self.effects = effects
+        self.cov_type = cov_type
+        self.cluster_col = cluster_col or entity_col
+        self.tol = tol
+        self.max_iter = max_iter
+        self.params = None
+        self.results = None
+
+    def _within(self, Z, entity_codes, n_entities, time_codes, n_times):
+        if self.effects == 'entity':
+            return demean(Z, entity_codes, n_entities), 1
+        if self.effects == 'time':
+            return demean(Z, time_codes, n_times), 1
+        # Relative to each column's magnitude: level series such as GDP in USD have rounding
+        # noise far above any absolute tolerance
+        scale = np.maximum(1.0, np.max(np.abs(Z), axis=0)) if len(Z) else 1.0
+        for iteration in range(1, self.max_iter + 1):
+            Z_new = demean(demean(Z, entity_codes, n_entities), time_codes, n_times)
+            if np.all(np.max(np.abs(Z_new - Z), axis=0) <= self.tol * scale):
+                return Z_new, iteration
+            Z = Z_new
+        print(f"Warning: alternating projections did not converge in {self.max_iter} iterations")
+        return Z, self.max_iter
+
+    def fit(self, df, y_col, x_cols):
+        """
+        Estimates the fixed-effects regression.
+
+        Args:
+            df (pd.DataFrame): Long panel with entity/time as columns or index levels
+                (e.g. the output of `DownloadWorldBank.run` or `GenerateFeatures.transform`).
+            y_col (str): Dependent variable.
+            x_cols (list): Regressors (no constant; it is absorbed by the fixed effects).
+
+        Returns:
+            pd.DataFrame: Coefficient table indexed by regressor.
+        """
+        x_cols = [x_cols] if isinstance(x_cols, str) else list(x_cols)
+        id_cols = list(dict.fromkeys([self.entity_col, self.time_col, self.cluster_col]))
+        index_cols = [col for col in id_cols if col not in df.columns and col in df.index.names]
+        data = df.reset_index(level=index_cols) if index_cols else df
+        data = data[id_cols + [y_col] + x_cols].dropna()
+
+        entity_codes, entities = pd.factorize(data[self.entity_col])
+        time_codes, times = pd.factorize(data[self.time_col])
+        Z = data[[y_col] + x_cols].to_numpy(dtype=float)
+        Z, self.n_iter = self._within(Z, entity_codes, len(entities), time_codes, len(times))
+        y, X = Z[:, 0], Z[:, 1:]
+
+        n, k = X.shape
+        if self.effects == 'entity':
+            n_absorbed = len(entities)
+        elif self.effects == 'time':
+            n_absorbed = len(times)
+        else:
+            n_absorbed = len(entities) + len(times) - 1
+        df_resid = n - k - n_absorbed
+
+        XtX_inv = np.linalg.pinv(X.T @ X)
+        beta = XtX_inv @ (X.T @ y)
+        resid = y - X @ beta
+
+        if self.cov_type == 'nonrobust':
+            cov = XtX_inv * (resid @ resid) / df_resid
+            dist = stats.t(df_resid)
+        elif self.cov_type == 'HC1':
+            meat = (X * resid[:, None] ** 2).T @ X
+            cov = XtX_inv @ meat @ XtX_inv * n / df_resid
+            dist = stats.norm()
+        else:
+            cluster_codes, clusters = pd.factorize(data[self.cluster_col])
+            n_clusters = len(clusters)
+            scores = np.column_stack([np.bincount(cluster_codes, weights=X[:, j] * resid, minlength=n_clusters)
+                                      for j in range(k)])
+            correction = n_clusters / (n_clusters - 1) * (n - 1) / df_resid
+            cov = XtX_inv @ (scores.T @ scores) @ XtX_inv * correction
+            dist = stats.norm()
+
+        std_err = np.sqrt(np.diag(cov))
+        t_values = beta / std_err
+        crit = dist.ppf(0.975)
+        self.params = pd.Series(beta, index=x_cols)
+        self.results = pd.DataFrame({
+            'coef': beta,
+            'std_err': std_err,
+            't': t_values,
+            'pvalue': 2 * dist.sf(np.abs(t_values)),
+            'ci_low': beta - crit * std_err,
+            'ci_high': beta + crit * std_err,
+        }, index=x_cols)
+
+        self.nobs = n
+        self.df_resid = df_resid
+        self.n_entities = len(entities)
+        self.n_times = len(times)
+        self.rsquared_within = 1 - (resid @ resid) / (y @ y) if y @ y > 0 else np.nan
+        print(f"Fixed effects ({self.effects}, {self.cov_type}): {n} obs, {self.n_entities} entities, "
+              f"{self.n_times} periods, within R-squared {self.rsquared_within:.3f}")
+        return self.results
+
+
+if __name__ == '__main__':
+    # Example Usage: same model as smf.ols('NGDPDPC_log ~ v2x_freexp_scale + C(country)')
+    df = pd.read_csv("data/examples/module_3/democracy_gdp.csv")
+    df['NGDPDPC_log'] = np.log(df['NGDPDPC'])
+    df['v2x_freexp_scale'] = df['v2x_freexp'] * 100
+
+    fe = PanelRegression(entity_col='country', time_col='year', effects='entity', cov_type='cluster')
+    print(fe.fit(df, y_col='NGDPDPC_log', x_cols=['v2x_freexp_scale']))
+
+    fe_twoway = PanelRegression(entity_col='country', time_col='year', effects='twoway', cov_type='HC1')
+    print(fe_twoway.fit(df, y_col='NGDPDPC_log', x_cols=['v2x_freexp_scale', 'v2x_pubcorr']))
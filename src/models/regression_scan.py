@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+class RegressionScan:
+    """
+    Fits every univariate regression y ~ const + x between two sets of columns at once.
+
+    Instead of one `sm.OLS` per pair, the scan builds missing-value masks and computes the pairwise
+    sufficient statistics (observation counts, sums, sums of squares and cross-products)
+    as matrix products. Each pair uses exactly the rows where both y and x are observed,
+    which is what `dropna()` before `sm.OLS` would give, and the resulting slope, standard
+    error, t, p-value and R-squared match the non-robust statsmodels fit.
+
+    Attributes:
+        min_obs (int): Pairs with fewer joint observations are dropped.
+        sort_by (str): Column used to rank the output table.
+        chunk_size (int): Number of y columns processed per matrix pass (bounds memory).
+        results (pd.DataFrame): Ranked table from the last `scan`.
+
+    Methods:
+        scan(self, df, y_cols=None, x_cols=None) -> pd.DataFrame
+    """
+    def __init__(self, min_obs=10, sort_by='pvalue', chunk_size=500):
+        """
+        Initializes RegressionScan.
+
+        Args:
+            min_obs (int, optional): Minimum joint observations per pair. Defaults to 10.
+            sort_by (str, optional): Ranking column ('pvalue', 'rsquared', ...). Defaults to 'pvalue'.
+            chunk_size (int, optional): y columns per matrix pass. Defaults to 500.
+        """
+        self.min_obs = min_obs
+        self.sort_by = sort_by
+        self.chunk_size = chunk_size
+        self.results = None
+
+    @staticmethod
+    def _prepare(values):
+        """
+        Centers each column on its mean (for numerical stability) and splits it into values and mask.
+
+        NaN and +/-inf (e.g. `changepct` from a zero base) are both treated as missing.
+        """
+        mask = np.isfinite(values)
+        has_data = mask.any(axis=0)
+        shift = np.zeros(values.shape[1])
+        shift[has_data] = np.where(mask, values, 0.0)[:, has_data].sum(axis=0) / mask[:, has_data].sum(axis=0)
+        centered = np.where(mask, values - shift, 0.0)
+        return centered, mask.astype(float), shift
+
+    def _scan_block(self, Y, My, y_shift, X, Mx, x_shift):
+        n = My.T @ Mx
+        sum_x = My.T @ X
+        sum_y = Y.T @ Mx
+        sum_xx = My.T @ (X * X)
+        sum_yy = (Y * Y).T @ Mx
+        sum_xy = Y.T @ X
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_x = sum_x / n
+            mean_y = sum_y / n
+            sxx = sum_xx - sum_x * mean_x
+            syy = sum_yy - sum_y * mean_y
+            sxy = sum_xy - sum_x * mean_y
+
+            slope = sxy / sxx
+            intercept = (mean_y + y_shift[:, None]) - slope * (mean_x + x_shift[None, :])
+            rsquared = sxy ** 2 / (sxx * syy)
+            dof = n - 2
+            ssr = np.maximum(syy - slope * sxy, 0)
+            std_err = np.sqrt(ssr / dof / sxx)
+            t_values = slope / std_err
+        pvalues = 2 * stats.t.sf(np.abs(t_values), np.maximum(dof, 1))
+        return {'n': n, 'slope': slope, 'intercept': intercept, 'std_err': std_err,
+                't': t_values, 'pvalue': pvalues, 'rsquared': rsquared}
+
+    def scan(self, df, y_cols=None, x_cols=None):
+        """
+        Regresses every y column on every x column.
+
+        Args:
+            df (pd.DataFrame): Wide frame, e.g. the output of `GenerateFeatures.transform`.
+            y_cols (list, optional): Dependent variables. Defaults to all numeric columns.
+            x_cols (list, optional): Regressors. Defaults to all numeric columns.
+
+        Returns:
+            pd.DataFrame: One row per (y, x) pair with n, slope, intercept, std_err, t,
+                pvalue and rsquared, ranked by `sort_by`.
+        """
+        num_cols = df.select_dtypes(include='number').columns.tolist()
+        y_cols = num_cols if y_cols is None else list(y_cols)
+        x_cols = num_cols if x_cols is None else list(x_cols)
+
+        X, Mx, x_shift = self._prepare(df[x_cols].to_numpy(dtype=float))
+        x_names = np.array(x_cols, dtype=object)
+        tables = []
+        for start in range(0, len(y_cols), self.chunk_size):
+            block_cols = y_cols[start:start + self.chunk_size]
+            Y, My, y_shift = self._prepare(df[block_cols].to_numpy(dtype=float))
+            stats_block = self._scan_block(Y, My, y_shift, X, Mx, x_shift)
+
+            y_names = np.array(block_cols, dtype=object)
+            keep = (stats_block['n'] >= self.min_obs) & (y_names[:, None] != x_names[None, :])
+            rows, cols = np.nonzero(keep)
+            table = pd.DataFrame({'y': y_names[rows], 'x': x_names[cols]})
+            for name, values in stats_block.items():
+                table[name] = values[rows, cols]
+            tables.append(table)
+
+        results = pd.concat(tables, ignore_index=True)
+        results['n'] = results['n'].astype(int)
+        ascending = self.sort_by in ('pvalue', 'std_err')
+        self.results = results.sort_values(self.sort_by, ascending=ascending, ignore_index=True)
+        print(f"Scanned {len(self.results)} regressions ({len(y_cols)} y x {len(x_cols)} x columns)")
+        return self.results
+
+
+if __name__ == '__main__':
+    # Example Usage
+    from src.features.generate_features import GenerateFeatures
+
+    df = pd.read_csv("data/examples/module_3/democracy_gdp.csv")
+    df_feat = GenerateFeatures(rolling_window=3, features=["changepct", "lag1", "zscore"], time_period='YE').transform(df)
+    scanner = RegressionScan(min_obs=30)
+    print(scanner.scan(df_feat, y_cols=['NGDPDPC', 'NGDP_RPCH']).head(20))
@@ -0,0 +1,264 @@
+import itertools
+import math
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import GroupKFold, KFold
+
+
+def _fit_score(estimator, params, X_train, y_train, X_test, y_test, scoring):
+    """Fits one candidate on one cached fold; runs inside a worker process."""
+    model = clone(estimator).set_params(**params)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - start
+    if scoring is None:
+        score = model.score(X_test, y_test)
+    else:
+        score = get_scorer(scoring)(model, X_test, y_test)
+    return score, fit_s
+
+
+class SelectModels:
+    """
+    Cross-validated grid search with cached fold preprocessing and successive halving.
+
+    Preprocessing steps (e.g. StandardScaler, PCA) are fitted once per fold and per
+    preprocessing setting, and the transformed arrays are reused by every grid point that
+    shares them. Candidate fits run in parallel worker processes (joblib memory-maps the
+    cached arrays instead of copying them to each worker). With successive halving, all
+    candidates are first scored on a few folds and only the best 1/`halving_factor` move
+    on to the next round, which adds more folds.
+
+    Parameter grid keys follow sklearn's pipeline convention: `<step>__<param>` for a
+    preprocessing step (e.g. 'pca__n_components') and plain names for the estimator.
+
+    Attributes:
+        estimator: Any sklearn-compatible estimator (DecisionTreeRegressor, RandomForestClassifier,
+            MLPRegressor, or a torch model wrapped with fit/predict/score).
+        param_grid (dict): Parameter name -> list of values.
+        preprocess (list): (name, transformer) steps applied before the estimator.
+        cv (str): 'kfold', 'group' (whole countries held out) or 'time' (expanding window over years).
+        n_splits (int): Number of folds.
+        groups_col (str): Column holding the country for 'group' CV.
+        time_col (str): Column holding the year/date for 'time' CV.
+        scoring (str): sklearn scorer name; None uses `estimator.score`.
+        halving_factor (int): Share of candidates kept per round is 1/halving_factor; None disables halving.
+        min_folds (int): Folds used in the first halving round.
+        n_jobs (int): Worker processes.
+        results (pd.DataFrame): One row per candidate after `fit`.
+        best_params (dict): Parameters of the best candidate.
+        timing (dict): Wall-clock totals from the last `fit`.
+
+    Methods:
+        fit(self, df, y_col, x_cols) -> pd.DataFrame
+    """
+    def __init__(self, estimator, param_grid, preprocess=None, cv='kfold', n_splits=5, groups_col='country',
+                 time_col='year', scoring=None, halving_factor=3, min_folds=1, n_jobs=4, random_state=42):
+        """
+        Initializes SelectModels.
+
+        Args:
+            estimator: Estimator to tune.
+            param_grid (dict): Grid of parameters.
+            preprocess (list, optional): (name, transformer) steps. Defaults to None.
+            cv (str, optional): 'kfold', 'group' or 'time'. Defaults to 'kfold'.
+            n_splits (int, optional): Number of folds. Defaults to 5.
+            groups_col (str, optional): Group column for 'group' CV. Defaults to 'country'.
+            time_col (str, optional): Time column for 'time' CV. Defaults to 'year'.
+            scoring (str, optional): sklearn scorer name. Defaults to None.
+            halving_factor (int, optional): Successive-halving factor; None scores every
+                candidate on every fold. Defaults to 3.
+            min_folds (int, optional): Folds in the first halving round. Defaults to 1.
+            n_jobs (int, optional): Worker processes. Defaults to 4.
+            random_state (int, optional): Seed for 'kfold' shuffling. Defaults to 42.
+        """
+        if cv not in ('kfold', 'group', 'time'):
+            raise ValueError("cv must be 'kfold', 'group' or 'time'.")
+        if halving_factor is not None and halving_factor < 2:
+            raise ValueError("halving_factor must be at least 2 (or None to disable halving).")
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.preprocess = preprocess or []
+        self.cv = cv
+        self.n_splits = n_splits
+        self.groups_col = groups_col
+        self.time_col = time_col
+        self.scoring = scoring
+        self.halving_factor = halving_factor
+        self.min_folds = min_folds
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.step_names = {name for name, _ in self.preprocess}
+        self.fold_cache = {}
+        self.results = None
+        self.best_params = None
+        self.timing = {}
+
+    def split(self, df):
+        """
+        Returns the (train_idx, test_idx) positional folds for `df`.
+
+        'time' sorts the unique periods, cuts them into n_splits + 1 blocks and, for fold k,
+        trains on blocks 0..k and tests on block k + 1, across all countries at once.
+
+        Raises:
+            ValueError: If there are fewer groups than folds ('group'), or fewer periods
+                than n_splits + 1 ('time').
+        """
+        if self.cv == 'kfold':
+            return list(KFold(self.n_splits, shuffle=True, random_state=self.random_state).split(df))
+        if self.cv == 'group':
+            n_groups = df[self.groups_col].nunique()
+            if n_groups < self.n_splits:
+                raise ValueError(f"cv='group' needs at least n_splits={self.n_splits} groups, "
+                                 f"got {n_groups}; lower n_splits.")
+            return list(GroupKFold(self.n_splits).split(df, groups=df[self.groups_col]))
+
+        periods = np.sort(df[self.time_col].unique())
+        if len(periods) < self.n_splits + 1:
+            raise ValueError(f"cv='time' needs at least n_splits + 1 = {self.n_splits + 1} periods, "
+                             f"got {len(periods)}; lower n_splits.")
+        blocks = np.array_split(periods, self.n_splits + 1)
+        time_values = df[self.time_col].to_numpy()
+        folds = []
+        for k in range(self.n_splits):
+            train_idx = np.flatnonzero(time_values <= blocks[k][-1])
+            test_idx = np.flatnonzero(np.isin(time_values, blocks[k + 1]))
+            folds.append((train_idx, test_idx))
+        return folds
+
+    def _split_params(self, params):
+        pre = {k: v for k, v in params.items() if k.split('__', 1)[0] in self.step_names}
+        model = {k: v for k, v in params.items() if k not in pre}
+        return pre, model
+
+    def _prepared_fold(self, fold_id, pre_params):
+        """Fits the preprocessing steps for one fold once and caches the transformed arrays."""
+        key = (fold_id, tuple(sorted(pre_params.items())))
+        if key not in self.fold_cache:
+            train_idx, test_idx = self.folds[fold_id]
+            X_train, X_test = self.X[train_idx], self.X[test_idx]
+            for name, transformer in self.preprocess:
+                step_params = {k.split('__', 1)[1]: v for k, v in pre_params.items() if k.startswith(f'{name}__')}
+                step = clone(transformer).set_params(**step_params)
+                X_train = step.fit_transform(X_train)
+                X_test = step.transform(X_test)
+            self.fold_cache[key] = (X_train, self.y[train_idx], X_test, self.y[test_idx])
+        return self.fold_cache[key]
+
+    def fit(self, df, y_col, x_cols):
+        """
+        Runs the search.
+
+        Args:
+            df (pd.DataFrame): Data with the target, the features and the group/time columns.
+            y_col (str): Target column.
+            x_cols (list): Feature columns.
+
+        Returns:
+            pd.DataFrame: One row per candidate with mean/std score, folds used and fit times,
+                best first.
+        """
+        start = time.perf_counter()
+        df = df.dropna(subset=[y_col] + list(x_cols)).reset_index(drop=True)
+        self.X = df[x_cols].to_numpy(dtype=float)
+        self.y = df[y_col].to_numpy()
+        self.folds = self.split(df)
+        self.fold_cache = {}
+
+        keys = list(self.param_grid)
+        candidates = [dict(zip(keys, values)) for values in itertools.product(*self.param_grid.values())]
+        scores = {i: [] for i in range(len(candidates))}
+        fit_times = {i: [] for i in range(len(candidates))}
+        last_round = {i: 0 for i in range(len(candidates))}
+
+        alive = list(range(len(candidates)))
+        n_folds = self.n_splits if self.halving_factor is None else min(self.min_folds, self.n_splits)
+        folds_done = 0
+        preprocess_s = 0.0
+        round_id = 0
+        with Parallel(n_jobs=self.n_jobs) as parallel:
+            while True:
+                new_folds = range(folds_done, n_folds)
+                pre_start = time.perf_counter()
+                tasks = []
+                for i in alive:
+                    pre_params, model_params = self._split_params(candidates[i])
+                    for fold_id in new_folds:
+                        tasks.append((i, model_params, self._prepared_fold(fold_id, pre_params)))
+                preprocess_s += time.perf_counter() - pre_start
+
+                outputs = parallel(
+                    delayed(_fit_score)(self.estimator, model_params, *arrays, self.scoring)
+                    for _, model_params, arrays in tasks
+                )
+                for (i, _, _), (score, fit_s) in zip(tasks, outputs):
+                    scores[i].append(score)
+                    fit_times[i].append(fit_s)
+                    last_round[i] = round_id
+                folds_done = n_folds
+                print(f"Round {round_id}: {len(alive)} candidates x {len(new_folds)} new folds "
+                      f"({n_folds}/{self.n_splits} folds used)")
+
+                if self.halving_factor is None or len(alive) == 1 or n_folds == self.n_splits:
+                    break
+                n_keep = max(1, math.ceil(len(alive) / self.halving_factor))
+                alive = sorted(alive, key=lambda i: np.mean(scores[i]), reverse=True)[:n_keep]
+                n_folds = min(self.n_splits, n_folds * self.halving_factor)
+                round_id += 1
+
+        self.results = pd.DataFrame([
+            {**candidates[i],
+             'mean_score': np.mean(scores[i]),
+             'std_score': np.std(scores[i]),
+             'n_folds': len(scores[i]),
+             'round': last_round[i],
+             'mean_fit_s': np.mean(fit_times[i]),
+             'total_fit_s': np.sum(fit_times[i])}
+            for i in range(len(candidates))
+        ]).sort_values(['round', 'mean_score'], ascending=False, ignore_index=True)
+        best = max(range(len(candidates)), key=lambda i: (last_round[i], np.mean(scores[i])))
+        self.best_params = candidates[best]
+
+        wall_s = time.perf_counter() - start
+        self.timing = {
+            'wall_s': wall_s,
+            'preprocess_s': preprocess_s,
+            'n_fits': int(self.results['n_folds'].sum()),
+            'sum_fit_s': float(self.results['total_fit_s'].sum()),
+            'n_cached_folds': len(self.fold_cache),
+        }
+        print(f"Finished {self.timing['n_fits']} fits in {wall_s:.2f}s wall-clock "
+              f"({self.timing['sum_fit_s']:.2f}s of fitting, {preprocess_s:.2f}s preprocessing "
+              f"for {len(self.fold_cache)} cached folds)")
+        print(f"Best parameters: {self.best_params}")
+        return self.results
+
+
+if __name__ == '__main__':
+    # Example Usage
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.tree import DecisionTreeRegressor
+
+    df = pd.read_csv("data/examples/module_3/democracy_gdp.csv")
+    df['NGDPDPC_log'] = np.log(df['NGDPDPC'])
+    x_cols = ['v2x_frassoc_thick', 'v2x_pubcorr', 'v2xnp_regcorr', 'v2xel_frefair', 'v2x_freexp', 'v2elembcap']
+
+    selector = SelectModels(
+        estimator=DecisionTreeRegressor(random_state=42),
+        param_grid={
+            'pca__n_components': [2, 4, 6],
+            'max_depth': [2, 3, 5, 8, None],
+            'min_samples_leaf': [1, 5, 20],
+        },
+        preprocess=[('scaler', StandardScaler()), ('pca', PCA())],
+        cv='group',
+        n_splits=3,  # only 3 countries have GDP data after dropping missing rows
+    )
+    print(selector.fit(df, y_col='NGDPDPC_log', x_cols=x_cols).head(10))
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+
+import pandas as pd
+
+# Import statements that correspond to the common entry points
+ENTRY_POINTS = {
+    'download_only': "from src.data.download_worldbank import DownloadWorldBank",
+    'transform_only': "from src.features.generate_features import GenerateFeatures",
+    'run_pipeline': "from src.pipeline.run_pipeline import RunPipeline",
+    'descriptive': "from src.data.pipeline_wb_descriptive import PipelineWBDescriptive",
+    'plot_basic': "from src.viz.plot_basic import PlotBasic",
+}
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'statsmodels', 'sklearn', 'scipy', 'requests', 'pandas']
+
+
+def import_profile(statement, repeats=3):
+    """
+    Runs `statement` in a fresh interpreter with `python -X importtime` and parses the log.
+
+    Args:
+        statement (str): Python import statement.
+        repeats (int, optional): Runs to take the fastest of. Defaults to 3.
+
+    Returns:
+        dict: Total import time in ms (fastest run) and which heavy modules were loaded.
+    """
+    best_total, best_modules = None, None
+    for _ in range(repeats):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                              capture_output=True, text=True, check=True)
+        total_us, modules = 0, set()
+        for line in proc.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+            modules.add(name.split('.')[0])
+            # Top-level imports have no leading spaces before the module name
+            if not line.rsplit('|', 1)[1].startswith('  '):
+                total_us += int(cumulative)
+        if best_total is None or total_us < best_total:
+            best_total, best_modules = total_us, modules
+    return {'import_ms': best_total / 1000,
+            **{f'loads_{module}': module in best_modules for module in HEAVY_MODULES}}
+
+
+def benchmark_startup(entry_points=None, repeats=3):
+    """
+    Measures import time for each entry point.
+
+    Run from the repository root: `python -m src.pipeline.benchmark_startup`.
+
+    Returns:
+        pd.DataFrame: One row per entry point.
+    """
+    entry_points = ENTRY_POINTS if entry_points is None else entry_points
+    rows = [{'entry_point': name, **import_profile(statement, repeats)} for name, statement in entry_points.items()]
+    return pd.DataFrame(rows).set_index('entry_point')
+
+
+if __name__ == '__main__':
+    print(benchmark_startup().to_string())
@@ -0,0 +1,203 @@
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from src.data.download_worldbank import DownloadWorldBank
+from src.pipeline.run_pipeline import RunPipeline
+
+
+def expand_jobs(config):
+    """
+    Expands a batch config into one job per indicator set x country group x window.
+
+    Config format (JSON):
+        {
+          "indicator_sets": {"trade": ["NE.EXP.GNFS.ZS", "NE.IMP.GNFS.ZS"], ...},
+          "country_groups": {"north_america": ["US", "CA", "MX"], ...},
+          "windows": [["2010", "2023"], ["2000", "2009"]],
+          "features": ["changepct", "lag1"],      (optional, RunPipeline defaults otherwise)
+          "rolling_window": 3,                    (optional)
+          "time_period": "YE",                    (optional)
+          "output_dir": "data/features/batch"     (optional)
+        }
+
+    Returns:
+        list: Job dicts with a unique `name`.
+    """
+    output_dir = config.get('output_dir', "data/features/batch")
+    jobs = []
+    for (set_name, indicators), (group_name, countries), (date_start, date_end) in itertools.product(
+            config['indicator_sets'].items(), config['country_groups'].items(), config['windows']):
+        name = f"{set_name}__{group_name}__{date_start}_{date_end}"
+        jobs.append({
+            'name': name,
+            'indicators': list(indicators),
+            'countries': list(countries),
+            'date_start': str(date_start),
+            'date_end': str(date_end),
+            'features': config.get('features'),
+            'rolling_window': config.get('rolling_window', 3),
+            'time_period': config.get('time_period', 'YE'),
+            'output_path': os.path.join(output_dir, f"{name}.csv"),
+        })
+    return jobs
+
+
+def _download_key(indicator, job):
+    return indicator, tuple(sorted(job['countries'])), job['date_start'], job['date_end']
+
+
+def _download(key):
+    indicator, countries, date_start, date_end = key
+    start = time.perf_counter()
+    df = DownloadWorldBank(indicators=[indicator], countries=list(countries),
+                           date_start=date_start, date_end=date_end).run()
+    return key, df, time.perf_counter() - start
+
+
+def _transform(job, raw_df):
+    """Runs the transform step of one job; executed in a worker process."""
+    start = time.perf_counter()
+    pipeline = RunPipeline(
+        indicators=job['indicators'],
+        countries=job['countries'],
+        date_start=job['date_start'],
+        date_end=job['date_end'],
+        rolling_window=job['rolling_window'],
+        features=job['features'],
+        time_period=job['time_period'],
+        output_path=job['output_path'],
+    )
+    feature_data = pipeline.transform(input_df=raw_df, save_features=True)
+    transform_s = time.perf_counter() - start
+    validate_s = pipeline.validation_report['elapsed_s'] if pipeline.validation_report else 0.0
+    return {'rows': len(feature_data), 'columns': feature_data.shape[1], 'transform_s': transform_s,
+            'validate_s': validate_s, 'validate_share': validate_s / transform_s if transform_s else 0.0}
+
+
+class RunBatch:
+    """
+    Runs many RunPipeline configurations as one batch.
+
+    Every (indicator, country group, window) combination is downloaded once, even when
+    several jobs need it, with downloads running concurrently in threads. Each job then
+    merges its indicators and runs the transform step in its own process. Per-job feature
+    files go to `output_dir` together with `timing_summary.csv`.
+
+    Attributes:
+        jobs (list): Job dicts from `expand_jobs`.
+        n_jobs (int): Worker processes for the transform step.
+        n_downloads (int): Concurrent downloads.
+        summary (pd.DataFrame): Per-job timing after `run`.
+
+    Methods:
+        run(self) -> pd.DataFrame
+    """
+    def __init__(self, jobs, n_jobs=4, n_downloads=8, output_dir="data/features/batch"):
+        self.jobs = jobs
+        self.n_jobs = n_jobs
+        self.n_downloads = n_downloads
+        self.output_dir = output_dir
+        self.summary = None
+
+    def download(self):
+        """Downloads each unique (indicator, countries, window) once; returns {key: (df, seconds)}."""
+        keys = list(dict.fromkeys(_download_key(ind, job) for job in self.jobs for ind in job['indicators']))
+        n_requested = sum(len(job['indicators']) for job in self.jobs)
+        print(f"Step 1: Download {len(keys)} unique series ({n_requested} requested by {len(self.jobs)} jobs)")
+        with ThreadPoolExecutor(max_workers=self.n_downloads) as pool:
+            return {key: (df, seconds) for key, df, seconds in pool.map(_download, keys)}
+
+    def run(self):
+        """
+        Downloads, merges and transforms every job.
+
+        Returns:
+            pd.DataFrame: Timing summary, one row per job.
+        """
+        start = time.perf_counter()
+        downloads = self.download()
+        download_s = time.perf_counter() - start
+
+        raw_frames = {}
+        for job in self.jobs:
+            merged_df = None
+            for indicator in job['indicators']:
+                df = downloads[_download_key(indicator, job)][0]
+                merged_df = df if merged_df is None else pd.merge(merged_df, df, on=['country', 'date'], how='outer')
+            raw_frames[job['name']] = merged_df
+
+        print(f"\nStep 2: Transform {len(self.jobs)} jobs on {self.n_jobs} processes")
+        transform_start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.n_jobs) as pool:
+            futures = {job['name']: pool.submit(_transform, job, raw_frames[job['name']]) for job in self.jobs}
+            results = {name: future.result() for name, future in futures.items()}
+        transform_s = time.perf_counter() - transform_start
+
+        rows = []
+        for job in self.jobs:
+            rows.append({
+                'job': job['name'],
+                'n_indicators': len(job['indicators']),
+                'n_countries': len(job['countries']),
+                'download_s': sum(downloads[_download_key(ind, job)][1] for ind in job['indicators']),
+                **results[job['name']],
+                'output_path': job['output_path'],
+            })
+        self.summary = pd.DataFrame(rows)
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary_path = os.path.join(self.output_dir, 'timing_summary.csv')
+        self.summary.to_csv(summary_path, index=False)
+
+        total_s = time.perf_counter() - start
+        print(f"\nFinished {len(self.jobs)} jobs in {total_s:.2f}s "
+              f"(downloads {download_s:.2f}s, transforms {transform_s:.2f}s)")
+        print(f"Timing summary saved here: {summary_path}")
+        return self.summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run RunPipeline for many indicator/country/window configurations.")
+    parser.add_argument('--config', help="JSON batch config (see expand_jobs for the format).")
+    parser.add_argument('--indicators', nargs='+', help="Indicators for a single job (without --config).")
+    parser.add_argument('--countries', nargs='+', help="Countries for a single job (without --config).")
+    parser.add_argument('--date-start', default='2010')
+    parser.add_argument('--date-end', default='2023')
+    parser.add_argument('--features', nargs='+', help="Feature list passed to GenerateFeatures.")
+    parser.add_argument('--output-dir', default=None, help="Directory for per-job features and the timing summary.")
+    parser.add_argument('--n-jobs', type=int, default=4, help="Worker processes for the transform step.")
+    parser.add_argument('--n-downloads', type=int, default=8, help="Concurrent downloads.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    elif args.indicators and args.countries:
+        config = {
+            'indicator_sets': {'cli': args.indicators},
+            'country_groups': {'cli': args.countries},
+            'windows': [[args.date_start, args.date_end]],
+        }
+    else:
+        raise SystemExit("Provide --config, or --indicators and --countries.")
+    if args.features:
+        config['features'] = args.features
+    if args.output_dir:
+        config['output_dir'] = args.output_dir
+
+    output_dir = config.setdefault('output_dir', "data/features/batch")
+    batch = RunBatch(expand_jobs(config), n_jobs=args.n_jobs, n_downloads=args.n_downloads, output_dir=output_dir)
+    print(batch.run().to_string(index=False))
+
+
+if __name__ == '__main__':
+    # Example: python -m src.pipeline.run_batch --config src/pipeline/batch_config_example.json
+    main()
@@ -1,22 +1,42 @@
 # run_analysis.py
 
+import os
 from src.data.download_worldbank import DownloadWorldBank
+from src.data.validate_data import ValidateData
 from src.features.generate_features import GenerateFeatures
-from src.viz.plot_basic import PlotBasic  # Import the visualization class
 import pandas as pd
 
 class RunPipeline:
-    def __init__(self):
-        self.indicators = ['BX.KLT.DINV.WD.GD.ZS', 'MS.MIL.XPND.GD.ZS', 'NY.GDP.MKTP.CD', 'NE.EXP.GNFS.ZS', 'NE.IMP.GNFS.ZS']
-        self.countries = ['US', 'CA', 'MX', 'JP']
-        self.date_start = '2010'
-        self.date_end = '2023'
-        self.rolling_window = 3
-        self.features = ["changepct", "changeraw", "rollingmean", "log", "zscore", "lag1", "lag2"]
-        self.time_period = 'YE'
+    def __init__(self, indicators=None, countries=None, date_start='2010', date_end='2023', rolling_window=3,
+                 features=None, time_period='YE', output_path="data/features/wb_feat.csv", validate=True):
+        if indicators is None:
+            indicators = ['BX.KLT.DINV.WD.GD.ZS', 'MS.MIL.XPND.GD.ZS', 'NY.GDP.MKTP.CD', 'NE.EXP.GNFS.ZS', 'NE.IMP.GNFS.ZS']
+        if countries is None:
+            countries = ['US', 'CA', 'MX', 'JP']
+        if features is None:
+            features = ["changepct", "changeraw", "rollingmean", "log", "zscore", "lag1", "lag2"]
+        self.indicators = indicators
+        self.countries = countries
+        self.date_start = date_start
+        self.date_end = date_end
+        self.rolling_window = rolling_window
+        self.features = features
+        self.time_period = time_period
+        self.output_path = output_path
+        self.validate = validate
+        self.validation_report = None
         self.raw_data = None
+        self.download_duplicates = {}
         self.feature_data = None
-        self.viz = PlotBasic() # Instantiate the visualization class
+        self._viz = None
+
+    @property
+    def viz(self):
+        """Visualization class, imported on first use so download/transform runs skip matplotlib."""
+        if self._viz is None:
+            from src.viz.plot_basic import PlotBasic
+            self._viz = PlotBasic()
+        return self._viz
 
     def download(self, save_data=False):
         """Downloads data from the World Bank."""
@@ -28,6 +48,7 @@ class RunPipeline:
             date_end=self.date_end
         )
         self.raw_data = download_wb.run(save_data=save_data)
+        self.download_duplicates = download_wb.duplicate_keys
         print(self.raw_data.head(2))
         return self.raw_data
 
@@ -39,6 +60,15 @@ class RunPipeline:
             input_df = self.raw_data
 
         print('\nStep 2: Transform')
+        if self.validate:
+            validator = ValidateData(entity_col='country', time_col='date')
+            input_df = validator.validate(input_df)
+            self.validation_report = validator.report
+            # Duplicates in the raw download are dropped before pivoting; keep them visible here
+            self.validation_report['download_duplicate_keys'] = self.download_duplicates
+            if self.download_duplicates:
+                print(f"Validation: {sum(len(keys) for keys in self.download_duplicates.values())} duplicate keys "
+                      f"dropped during download ({', '.join(self.download_duplicates)})")
         transform_tool = GenerateFeatures(
             rolling_window=self.rolling_window,
             features=self.features,
@@ -46,9 +76,9 @@ class RunPipeline:
         )
         self.feature_data = transform_tool.transform(input_df)
         if save_features:
-            output_path = "data/features/wb_feat.csv"
-            self.feature_data.to_csv(output_path)
-            print(f'Saved features here: {output_path}')
+            os.makedirs(os.path.dirname(self.output_path) or '.', exist_ok=True)
+            self.feature_data.to_csv(self.output_path)
+            print(f'Saved features here: {self.output_path}')
         return self.feature_data
 
     def visualize(self, df):
@@ -0,0 +1,264 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import requests
+
+from src.features.aggregate_cube import AggregateCube
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a listen backlog sized for many simultaneous dashboard users."""
+    # The default backlog of 5 overflows under bursts of connections, and clients then wait for SYN retries
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def decimate_minmax(x, y, max_points):
+    """
+    Reduces a series to at most `max_points` points, keeping the min and max of each bucket.
+
+    Peaks and troughs survive (unlike plain subsampling), and the work is a handful of numpy
+    reductions rather than a Python loop. `y` must not contain NaNs.
+    """
+    n = len(x)
+    if n <= max_points:
+        return x, y
+    n_buckets = max(1, max_points // 2)
+    starts = np.linspace(0, n, n_buckets + 1).astype(int)[:-1]
+    local_min = np.minimum.reduceat(y, starts)
+    local_max = np.maximum.reduceat(y, starts)
+    bucket_of = np.repeat(np.arange(n_buckets), np.diff(np.append(starts, n)))
+    is_min = y == local_min[bucket_of]
+    is_max = y == local_max[bucket_of]
+    # First index per bucket hitting the min / max
+    idx_min = np.flatnonzero(is_min)[np.unique(bucket_of[is_min], return_index=True)[1]]
+    idx_max = np.flatnonzero(is_max)[np.unique(bucket_of[is_max], return_index=True)[1]]
+    keep = np.unique(np.concatenate([idx_min, idx_max]))
+    return x[keep], y[keep]
+
+
+class DashboardBackend:
+    """
+    Serves pre-aggregated, decimated series and descriptive stats as compact JSON.
+
+    The panel is split once into one sorted (time, value) array pair per
+    (country, indicator), and an `AggregateCube` holds the descriptive statistics. A query
+    then only slices the arrays, decimates them to `max_points`, and serializes the result;
+    identical queries are answered from an LRU cache without touching the data. Charts are
+    drawn client-side (Altair/Plotly) from the JSON, so the server never renders figures.
+
+    Attributes:
+        entity_col (str): Entity column. Defaults to 'country'.
+        time_col (str): Time column (datetime or integer year). Defaults to 'date'.
+        max_points (int): Default decimation target per series.
+        cube (AggregateCube): Descriptive statistics for the panel.
+
+    Methods:
+        series(self, countries, indicator, start=None, end=None, max_points=None, fmt='json') -> bytes
+        stats(self, countries, indicator, period='all') -> bytes
+        serve(self, host='127.0.0.1', port=8050) -> DashboardServer
+    """
+    def __init__(self, df, entity_col='country', time_col='date', max_points=500, cache_size=1024):
+        """
+        Initializes DashboardBackend and precomputes the per-series arrays.
+
+        Args:
+            df (pd.DataFrame): Wide panel, one numeric column per indicator.
+            entity_col (str, optional): Entity column. Defaults to 'country'.
+            time_col (str, optional): Time column. Defaults to 'date'.
+            max_points (int, optional): Default points per series. Defaults to 500.
+            cache_size (int, optional): Number of cached responses. Defaults to 1024.
+        """
+        self.entity_col = entity_col
+        self.time_col = time_col
+        self.max_points = max_points
+        data = df.sort_values([entity_col, time_col])
+        times = data[time_col]
+        times = times.dt.year if pd.api.types.is_datetime64_any_dtype(times) else times.astype(int)
+        self.indicators = [col for col in data.select_dtypes(include='number').columns if col != time_col]
+        self.arrays = {}
+        for entity, group in data.assign(_t=times.to_numpy()).groupby(entity_col, observed=True, sort=False):
+            t = group['_t'].to_numpy()
+            for indicator in self.indicators:
+                values = group[indicator].to_numpy(dtype=float)
+                mask = ~np.isnan(values)
+                self.arrays[(str(entity), indicator)] = (t[mask], values[mask])
+        self.cube = AggregateCube(entity_col=entity_col, time_col=time_col).update(df)
+        self._series = lru_cache(maxsize=cache_size)(self._series_uncached)
+        self._stats = lru_cache(maxsize=cache_size)(self._stats_uncached)
+
+    def _series_uncached(self, countries, indicator, start, end, max_points, fmt):
+        payload = {'indicator': indicator, 'series': {}}
+        rows = []
+        for country in countries:
+            if (country, indicator) not in self.arrays:
+                continue
+            t, v = self.arrays[(country, indicator)]
+            lo = 0 if start is None else np.searchsorted(t, start, side='left')
+            hi = len(t) if end is None else np.searchsorted(t, end, side='right')
+            t, v = decimate_minmax(t[lo:hi], v[lo:hi], max_points)
+            payload['series'][country] = {'t': t.tolist(), 'v': v.tolist()}
+            rows.append(pd.DataFrame({'country': country, 'time': t, 'value': v}))
+        if fmt == 'arrow':
+            import pyarrow as pa
+            table = pa.Table.from_pandas(pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(
+                {'country': [], 'time': [], 'value': []}), preserve_index=False)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue().to_pybytes()
+        return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+    def _stats_uncached(self, countries, indicator, period):
+        table = self.cube.describe(indicator, countries=list(countries), period=period)
+        return table.to_json(orient='index').encode('utf-8')
+
+    def series(self, countries, indicator, start=None, end=None, max_points=None, fmt='json'):
+        """
+        Returns decimated series for the selected countries.
+
+        Args:
+            countries (list): Countries to include.
+            indicator (str): Indicator column.
+            start (int, optional): First year. Defaults to None.
+            end (int, optional): Last year. Defaults to None.
+            max_points (int, optional): Points per series. Defaults to `self.max_points`.
+            fmt (str, optional): 'json' or 'arrow' (Arrow IPC stream, needs pyarrow). Defaults to 'json'.
+
+        Returns:
+            bytes: `{"indicator": ..., "series": {country: {"t": [...], "v": [...]}}}` as JSON,
+                or an Arrow table with country/time/value columns.
+        """
+        return self._series(tuple(sorted(str(c) for c in countries)), indicator, start, end,
+                            max_points or self.max_points, fmt)
+
+    def stats(self, countries, indicator, period='all'):
+        """Returns describe()-style statistics per country from the cube, as JSON bytes."""
+        return self._stats(tuple(sorted(str(c) for c in countries)), indicator, period)
+
+    def cache_info(self):
+        """Hit/miss counters of the response caches."""
+        return {'series': self._series.cache_info()._asdict(), 'stats': self._stats.cache_info()._asdict()}
+
+    def serve(self, host='127.0.0.1', port=8050):
+        """
+        Starts a threaded HTTP server in the background and returns it.
+
+        Endpoints:
+            GET /series?countries=USA,JPN&indicator=X&start=2000&end=2020&max_points=200&fmt=json
+                (fmt=arrow returns an Arrow IPC stream; needs pyarrow)
+            GET /stats?countries=USA,JPN&indicator=X&period=all
+        """
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive: clients reuse one connection instead of reconnecting for every request
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                countries = [c for c in query.get('countries', '').split(',') if c]
+                content_type = 'application/json'
+                try:
+                    if url.path == '/series':
+                        fmt = query.get('fmt', 'json')
+                        if fmt not in ('json', 'arrow'):
+                            raise ValueError("fmt must be 'json' or 'arrow'")
+                        body = backend.series(
+                            countries, query['indicator'],
+                            start=int(query['start']) if 'start' in query else None,
+                            end=int(query['end']) if 'end' in query else None,
+                            max_points=int(query['max_points']) if 'max_points' in query else None,
+                            fmt=fmt,
+                        )
+                        if fmt == 'arrow':
+                            content_type = 'application/vnd.apache.arrow.stream'
+                    elif url.path == '/stats':
+                        period = query.get('period', 'all')
+                        body = backend.stats(countries, query['indicator'], int(period) if period.isdigit() else period)
+                    else:
+                        self.send_error(404)
+                        return
+                except ImportError:
+                    self.send_error(400, "fmt=arrow needs pyarrow installed on the server")
+                    return
+                except (KeyError, ValueError) as exc:
+                    self.send_error(400, str(exc))
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        httpd = DashboardServer((host, port), Handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        print(f"Dashboard backend serving on http://{host}:{httpd.server_address[1]}")
+        return httpd
+
+
+def load_test(base_url, queries, n_clients=50, requests_per_client=20):
+    """
+    Simulates many dashboard users hitting the backend at once.
+
+    Args:
+        base_url (str): e.g. 'http://127.0.0.1:8050'.
+        queries (list): Query strings (e.g. 'series?countries=USA&indicator=X') cycled by the clients.
+        n_clients (int, optional): Concurrent clients. Defaults to 50.
+        requests_per_client (int, optional): Requests per client. Defaults to 20.
+
+    Returns:
+        dict: Request count, throughput and latency percentiles in milliseconds.
+    """
+    def client(client_id):
+        latencies = []
+        with requests.Session() as session:
+            for i in range(requests_per_client):
+                query = queries[(client_id + i) % len(queries)]
+                start = time.perf_counter()
+                session.get(f"{base_url}/{query}").raise_for_status()
+                latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_clients) as pool:
+        latencies = np.concatenate([np.array(l) for l in pool.map(client, range(n_clients))]) * 1000
+    elapsed = time.perf_counter() - start
+    results = {
+        'requests': len(latencies),
+        'clients': n_clients,
+        'requests_per_s': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'max_ms': float(latencies.max()),
+    }
+    print(results)
+    return results
+
+
+if __name__ == '__main__':
+    # Example Usage: serve democracy_gdp.csv and load-test it with 50 concurrent clients
+    df = pd.read_csv("data/examples/module_3/democracy_gdp.csv")
+    backend = DashboardBackend(df, entity_col='country', time_col='year', max_points=200)
+    server = backend.serve(port=0)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    groups = [['USA', 'JPN', 'KOR'], ['DEU', 'FRA'], ['BRA', 'MEX', 'ARG', 'CHL']]
+    queries = [f"series?countries={','.join(g)}&indicator={ind}&start={start}"
+               for g in groups for ind in ['NGDPDPC', 'v2x_freexp'] for start in [1990, 2000]]
+    queries += [f"stats?countries={','.join(g)}&indicator=NGDPDPC" for g in groups]
+    load_test(base_url, queries, n_clients=50, requests_per_client=20)
+    print(backend.cache_info())
+    server.shutdown()
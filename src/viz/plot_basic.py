@@ -1,5 +1,4 @@
 import os
-import statsmodels.api as sm
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -16,6 +15,8 @@ class PlotBasic:
         print(f"Saved plot to: {filepath}")
 
     def plot_scatter(self, df, y_data, y_feat, x_data, x_feat, x_label, y_label):
+        import statsmodels.api as sm
+
         y_col = f"{y_data}_{y_feat}" if y_feat else y_data
         x_col = f"{x_data}_{x_feat}" if x_feat else x_data
         data = df[[x_col, y_col, 'country']].dropna()
@@ -0,0 +1,262 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def simplify_line(points, tolerance):
+    """
+    Douglas-Peucker simplification of one ring/line.
+
+    Uses an explicit stack instead of recursion and computes all point-to-segment distances
+    of a span with numpy at once.
+
+    Args:
+        points (np.ndarray): (n, 2) coordinates.
+        tolerance (float): Maximum allowed deviation, in coordinate units (degrees).
+
+    Returns:
+        np.ndarray: Simplified coordinates (first and last points are always kept).
+    """
+    n = len(points)
+    if n < 3 or tolerance <= 0:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        inner = points[start + 1:end] - points[start]
+        seg_len = np.hypot(*segment)
+        if seg_len == 0:
+            dists = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            dists = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / seg_len
+        idx = int(np.argmax(dists))
+        if dists[idx] > tolerance:
+            split = start + 1 + idx
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+
+
+def simplify_geometry(geometry, tolerance, decimals):
+    """
+    Simplifies a (Multi)Polygon and rounds its coordinates.
+
+    A ring that simplifies to fewer than 4 points is replaced by its bounding ring, or dropped
+    when it is smaller than `tolerance`; consecutive points that round to the same coordinate
+    are merged. Polygons that lose their outer ring are dropped, and None is returned when
+    nothing is left (the feature is too small for this level).
+    """
+    def ring(coords):
+        points = np.asarray(coords, dtype=float)
+        simplified = simplify_line(points, tolerance)
+        if len(simplified) < 4:
+            (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+            if max(x1 - x0, y1 - y0) < tolerance:
+                return None
+            simplified = np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]])
+        rounded = np.round(simplified, decimals)
+        changed = np.any(rounded[1:] != rounded[:-1], axis=1)
+        rounded = np.concatenate([rounded[:1], rounded[1:][changed]])
+        return rounded.tolist() if len(rounded) >= 4 else None
+
+    def polygon(rings):
+        exterior = ring(rings[0])
+        if exterior is None:
+            return None
+        return [exterior] + [hole for hole in map(ring, rings[1:]) if hole is not None]
+
+    if geometry['type'] == 'Polygon':
+        coordinates = polygon(geometry['coordinates'])
+        return None if coordinates is None else {'type': 'Polygon', 'coordinates': coordinates}
+    if geometry['type'] == 'MultiPolygon':
+        polygons = [p for p in map(polygon, geometry['coordinates']) if p is not None]
+        return {'type': 'MultiPolygon', 'coordinates': polygons} if polygons else None
+    return geometry
+
+
+_worker_geojson = {}
+
+
+def _load_worker_geojson(path):
+    with open(path) as f:
+        _worker_geojson['geo'] = json.load(f)
+
+
+def _render_year(args):
+    """Renders one choropleth; runs in a worker process with the GeoJSON loaded once per worker."""
+    import plotly.express as px
+
+    df_year, value_col, year, title, output_path, range_color = args
+    start = time.perf_counter()
+    fig = px.choropleth(
+        df_year, geojson=_worker_geojson['geo'], locations='country', featureidkey='properties.iso3',
+        color=value_col, range_color=range_color, color_continuous_scale='Viridis',
+        title=f"{title} ({year})",
+    )
+    fig.update_geos(fitbounds='locations', visible=False)
+    fig.write_html(output_path, include_plotlyjs='cdn')
+    return year, output_path, time.perf_counter() - start
+
+
+class PlotMap:
+    """
+    Country choropleths from World Bank panels with cached, simplified boundaries.
+
+    Boundaries are read from a local GeoJSON (e.g. Natural Earth admin-0 countries) and
+    simplified once per zoom level with Douglas-Peucker, coordinates rounded to the
+    precision that level needs, and properties reduced to the ISO3 code. Each level is
+    serialized once to `cache_dir` and reused until the source file changes, so maps
+    never re-read or re-serialize full-resolution shapes. `plot_years` renders one
+    Plotly HTML map per year in parallel processes.
+
+    Attributes:
+        boundaries_path (str): Source GeoJSON.
+        iso_properties (tuple): Feature properties tried, in order, for the ISO3 code.
+        levels (dict): zoom level -> (tolerance in degrees, coordinate decimals).
+        cache_dir (str): Directory for the simplified GeoJSON files.
+        output_dir (str): Directory for rendered maps.
+        timings (dict): Timings of the last simplification and rendering runs.
+
+    Methods:
+        geojson(self, level=1) -> dict
+        plot_years(self, df, value_col, level=1, title=None, n_jobs=4) -> list
+    """
+    def __init__(self, boundaries_path="data/raw/countries.geojson", iso_properties=('ISO_A3', 'ADM0_A3', 'iso_a3'),
+                 levels=None, cache_dir="data/intermediate/geo_cache", output_dir='reports/viz/maps/'):
+        """
+        Initializes PlotMap.
+
+        Args:
+            boundaries_path (str, optional): Source GeoJSON. Defaults to "data/raw/countries.geojson".
+            iso_properties (tuple, optional): Properties holding the ISO3 code. Defaults to
+                ('ISO_A3', 'ADM0_A3', 'iso_a3'); '-99' values fall through to the next one.
+            levels (dict, optional): zoom -> (tolerance, decimals).
+                Defaults to {0: (0.5, 1), 1: (0.1, 2), 2: (0.02, 3)}.
+            cache_dir (str, optional): Simplified GeoJSON cache. Defaults to "data/intermediate/geo_cache".
+            output_dir (str, optional): Map output directory. Defaults to 'reports/viz/maps/'.
+        """
+        self.boundaries_path = boundaries_path
+        self.iso_properties = iso_properties
+        self.levels = levels or {0: (0.5, 1), 1: (0.1, 2), 2: (0.02, 3)}
+        self.cache_dir = cache_dir
+        self.output_dir = output_dir
+        self.timings = {}
+        self._geojson = {}
+
+    def cache_path(self, level):
+        """Cache file for a level; the settings are part of the name so changing them never reuses old shapes."""
+        name = os.path.splitext(os.path.basename(self.boundaries_path))[0]
+        tolerance, decimals = self.levels[level]
+        return os.path.join(self.cache_dir, f"{name}_z{level}_t{tolerance:g}_d{decimals}.geojson")
+
+    def _iso3(self, properties):
+        for key in self.iso_properties:
+            code = properties.get(key)
+            if code and code != '-99':
+                return code
+        return None
+
+    def build_cache(self):
+        """Simplifies the boundaries for every level and writes the serialized GeoJSON files."""
+        with open(self.boundaries_path) as f:
+            source = json.load(f)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for level, (tolerance, decimals) in self.levels.items():
+            start = time.perf_counter()
+            features = []
+            for feature in source['features']:
+                iso3 = self._iso3(feature.get('properties') or {})
+                if iso3 is None or feature.get('geometry') is None:
+                    continue
+                geometry = simplify_geometry(feature['geometry'], tolerance, decimals)
+                if geometry is not None:
+                    features.append({'type': 'Feature', 'properties': {'iso3': iso3}, 'geometry': geometry})
+            serialized = json.dumps({'type': 'FeatureCollection', 'features': features}, separators=(',', ':'))
+            with open(self.cache_path(level), 'w') as f:
+                f.write(serialized)
+            self.timings[f'simplify_z{level}_s'] = time.perf_counter() - start
+            print(f"Level {level}: {len(features)} countries, {len(serialized) / 1e6:.2f} MB "
+                  f"({self.timings[f'simplify_z{level}_s']:.2f}s)")
+        self._geojson.clear()
+
+    def _cache_is_fresh(self):
+        source_mtime = os.path.getmtime(self.boundaries_path)
+        return all(os.path.exists(self.cache_path(level)) and os.path.getmtime(self.cache_path(level)) >= source_mtime
+                   for level in self.levels)
+
+    def geojson(self, level=1):
+        """
+        Returns the simplified GeoJSON for a zoom level, building the cache if needed.
+
+        Args:
+            level (int, optional): Zoom level key of `levels`. Defaults to 1.
+
+        Returns:
+            dict: FeatureCollection with `properties.iso3` on every feature.
+        """
+        if not self._cache_is_fresh():
+            self.build_cache()
+        if level not in self._geojson:
+            with open(self.cache_path(level)) as f:
+                self._geojson[level] = json.load(f)
+        return self._geojson[level]
+
+    def plot_years(self, df, value_col, level=1, title=None, n_jobs=4):
+        """
+        Renders one choropleth per year in parallel.
+
+        Args:
+            df (pd.DataFrame): Panel with ISO3 `country` and `date` columns (`DownloadWorldBank.run` output).
+            value_col (str): Column to map.
+            level (int, optional): Boundary zoom level. Defaults to 1.
+            title (str, optional): Map title. Defaults to `value_col`.
+            n_jobs (int, optional): Worker processes. Defaults to 4.
+
+        Returns:
+            list: Paths of the written HTML maps.
+        """
+        self.geojson(level)  # make sure the cache for this level exists before workers read it
+        os.makedirs(self.output_dir, exist_ok=True)
+        data = df.reset_index() if 'country' not in df.columns else df
+        years = data['date'].dt.year if pd.api.types.is_datetime64_any_dtype(data['date']) else data['date'].astype(int)
+        data = pd.DataFrame({'country': data['country'].astype(str), 'year': years, value_col: data[value_col]}).dropna()
+        # One colour scale for every year so maps are comparable
+        range_color = (float(data[value_col].min()), float(data[value_col].max()))
+        safe_name = value_col.replace('.', '_')
+
+        tasks = [(group[['country', value_col]], value_col, year, title or value_col,
+                  os.path.join(self.output_dir, f"{safe_name}_{year}.html"), range_color)
+                 for year, group in data.groupby('year')]
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_load_worker_geojson,
+                                 initargs=(self.cache_path(level),)) as pool:
+            results = list(pool.map(_render_year, tasks))
+        wall_s = time.perf_counter() - start
+
+        per_map = [seconds for _, _, seconds in results]
+        self.timings.update({'render_wall_s': wall_s, 'render_maps': len(results),
+                             'render_mean_s': float(np.mean(per_map)) if per_map else 0.0})
+        print(f"Rendered {len(results)} maps in {wall_s:.2f}s wall-clock "
+              f"({self.timings['render_mean_s']:.2f}s per map) here: {self.output_dir}")
+        return [path for _, path, _ in results]
+
+
+if __name__ == '__main__':
+    # Example Usage (needs a local admin-0 GeoJSON, e.g. Natural Earth, at data/raw/countries.geojson)
+    from src.data.download_worldbank import DownloadWorldBank
+
+    df = DownloadWorldBank(indicators=['NY.GDP.PCAP.CD'], countries=['all'], date_start='2015', date_end='2023').run()
+    maps = PlotMap()
+    maps.build_cache()
+    maps.plot_years(df, 'NY.GDP.PCAP.CD', level=1, title='GDP per capita')
+    print(maps.timings)
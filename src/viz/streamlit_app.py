@@ -1,20 +1,35 @@
+import json
+import os
+import sys
+import altair as alt
 import pandas as pd
 import streamlit as st
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+# `streamlit run src/viz/streamlit_app.py` only puts src/viz on the path; add the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.viz.dashboard_backend import DashboardBackend
+
+
+@st.cache_data
+def load_data(url):
+    df = pd.read_excel(url, sheet_name="GHG_totals_by_country", header=0)
+    df_long = df.set_index(['Country']).drop(['EDGAR Country Code'], axis=1).stack().to_frame('emissions')
+    return df_long.reset_index().rename({"level_1":'year'}, axis='columns')
+
+
+@st.cache_resource
+def build_backend(df):
+    # Built once per dataset; widget interactions afterwards hit the backend's response cache
+    return DashboardBackend(df, entity_col='Country', time_col='year', max_points=300)
 
 st.title("Interactive Emissions Plot")
 st.markdown("Select countries to visualize their emissions over time.")
 url = "https://github.com/Graspp-25-Spring/GraSPP-25S-climatechange/raw/refs/heads/main/data/raw/EDGAR_2024_GHG_booklet_2024.xlsx"
-df = pd.read_excel(url, sheet_name="GHG_totals_by_country", header=0)
-df_long = df.set_index(['Country']).drop(['EDGAR Country Code'], axis=1).stack().to_frame('emissions')
-df_long = df_long.reset_index().rename({"level_1":'year'}, axis='columns')
+df_long = load_data(url)
 
 countries =  ['Indonesia', 'India', 'Ireland']
 df_short = df_long.copy().query("Country in @countries")
-
-df_long = df.set_index(['Country']).drop(['EDGAR Country Code'], axis=1).stack().to_frame('emissions')
-df_long = df_long.reset_index().rename({"level_1":'year'}, axis='columns')
+backend = build_backend(df_short)
 
 selected_countries = st.multiselect(
     "Select Countries",
@@ -22,18 +37,19 @@ selected_countries = st.multiselect(
     default=list(df_short['Country'].unique())[0] if list(df_short['Country'].unique()) else None
 )
 
-fig, ax = plt.subplots()
 if selected_countries:
-    sns.lineplot(
-        df_short.query("Country in @selected_countries"),
-        x='year',
-        y='emissions',
-        hue='Country',
-        ax=ax
+    # The backend returns compact, decimated JSON; the chart is drawn in the browser by Vega-Lite
+    payload = json.loads(backend.series(selected_countries, 'emissions'))
+    df_plot = pd.concat(
+        [pd.DataFrame({'Country': country, 'year': s['t'], 'emissions': s['v']}) for country, s in payload['series'].items()],
+        ignore_index=True,
+    )
+    chart = alt.Chart(df_plot, title="Emissions Over Time by Country").mark_line().encode(
+        x=alt.X('year:Q', title="Year", axis=alt.Axis(format='d')),
+        y=alt.Y('emissions:Q', title="Emissions"),
+        color='Country:N',
     )
-    ax.set_xlabel("Year")
-    ax.set_ylabel("Emissions")
-    ax.set_title("Emissions Over Time by Country")
-    st.pyplot(fig)
+    st.altair_chart(chart, use_container_width=True)
+    st.dataframe(backend.cube.describe('emissions', countries=selected_countries))
 else:
-    st.warning("Please select at least one country.")
\ No newline at end of file
+    st.warning("Please select at least one country.")
@@ -0,0 +1,73 @@
+import pytest
+
+from src.features.annotate_text import AnnotateText, StubModelServer
+
+
+@pytest.fixture
+def server():
+    with StubModelServer(port=0, delay=0) as stub:
+        yield stub
+
+
+def make_annotator(server, tmp_path, **kwargs):
+    return AnnotateText(url=server.url, cache_path=str(tmp_path / "cache.sqlite"), **kwargs)
+
+
+def test_batches_respect_token_budget(server, tmp_path):
+    # 39 characters -> 10 estimated tokens each, so a 25-token budget fits two texts per request
+    texts = [f"document {i:02d} " + "x" * 27 for i in range(6)]
+    assert all(AnnotateText.count_tokens(text) == 10 for text in texts)
+    annotator = make_annotator(server, tmp_path, max_batch_tokens=25)
+
+    annotator.annotate(texts)
+
+    assert server.n_requests == 3
+    assert annotator.metrics['n_requests'] == 3
+    for batch in annotator._make_batches(range(len(texts)), texts):
+        assert sum(AnnotateText.count_tokens(text) for _, text in batch) <= 25
+
+
+def test_identical_texts_are_sent_once(server, tmp_path):
+    texts = ["emissions fell", "coal plant", "emissions fell", "emissions fell", "coal plant"]
+    annotator = make_annotator(server, tmp_path)
+
+    outputs = annotator.annotate(texts)
+
+    assert sorted(server.inputs) == ["coal plant", "emissions fell"]
+    assert annotator.metrics['n_unique'] == 2
+    assert outputs[0] == outputs[2] == outputs[3]
+
+
+def test_rerun_is_served_from_cache(server, tmp_path):
+    texts = [f"press release number {i}" for i in range(20)]
+    annotator = make_annotator(server, tmp_path, max_batch_tokens=20)
+    first = annotator.annotate(texts)
+    n_requests = server.n_requests
+
+    # A new client on the same cache file must not reach the server either
+    second = make_annotator(server, tmp_path, max_batch_tokens=20).annotate(texts)
+
+    assert server.n_requests == n_requests
+    assert second == first
+
+
+def test_rerun_reports_full_cache_hit_rate(server, tmp_path):
+    texts = [f"press release number {i}" for i in range(20)]
+    annotator = make_annotator(server, tmp_path)
+    annotator.annotate(texts)
+    assert annotator.metrics['cache_hit_rate'] == 0.0
+
+    annotator.annotate(texts)
+
+    assert annotator.metrics['cache_hit_rate'] == 1.0
+    assert annotator.metrics['n_requests'] == 0
+
+
+def test_results_come_back_in_input_order(server, tmp_path):
+    # One text per request and several requests in flight, so responses complete out of order
+    texts = [" ".join(["word"] * n) for n in range(1, 31)]
+    annotator = make_annotator(server, tmp_path, max_batch_size=1, concurrency=8)
+
+    outputs = annotator.annotate(texts)
+
+    assert [output['n_words'] for output in outputs] == list(range(1, 31))
@@ -0,0 +1,47 @@
+import pytest
+
+from src.features.inverted_index import InvertedIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = InvertedIndex(index_dir=str(tmp_path / "index"))
+    index.add_documents(
+        ['2025-01-10', '2025-02-10', '2025-03-10', '2025-04-10'],
+        [
+            "The climate target for 2030 is a 55% cut, known as Fit for 55.",
+            "Climate neutrality by 2050.",
+            "Fit for purpose rules for 2030 reporting.",
+            "Climate law adopted.",
+        ],
+    )
+    return index
+
+
+def doc_ids(result):
+    return result['doc_id'].tolist()
+
+
+def test_numeric_terms_are_indexed(index):
+    assert doc_ids(index.search('climate 2030')) == [0]
+    assert doc_ids(index.search('2030')) == [0, 2]
+    assert doc_ids(index.search('climate -2030')) == [1, 3]
+
+
+def test_numeric_phrase_matches_exactly(index):
+    assert doc_ids(index.search('"fit for 55"')) == [0]
+    assert doc_ids(index.search('"fit for"')) == [0, 2]
+
+
+def test_terms_without_tokens_are_ignored(index):
+    # '%' tokenizes to nothing; it must not turn the clause into "no documents"
+    assert doc_ids(index.search('climate %')) == [0, 1, 3]
+    assert doc_ids(index.search('%')) == []
+
+
+def test_segments_and_compaction_keep_results(index):
+    index.add_documents(['2025-05-10'], ["Fit for 55 package completed in 2030 review."])
+    assert doc_ids(index.search('"fit for 55"')) == [0, 4]
+    index.compact()
+    reopened = InvertedIndex(index_dir=index.index_dir)
+    assert doc_ids(reopened.search('"fit for 55"', date_start='2025-02-01')) == [4]